@@ -10,35 +10,43 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+from hook_utils import ensure_dir, read_hook_input
+
+# Log locations are resolved once per process rather than on every call
+LOG_DIR = Path(os.getenv('CLAUDE_PROJECT_DIR', Path.cwd())) / 'logs'
+LOG_FILE = LOG_DIR / 'bash-command-log.txt'
+ERROR_LOG_FILE = LOG_DIR / 'bash-command-log-errors.txt'
+
+
+def append_to_log(log_file, entry):
+    """Append entry with a single O_APPEND write, bypassing Python's file buffering"""
+    fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, entry.encode('utf-8'))
+    finally:
+        os.close(fd)
+
 
 def log_bash_command():
     """Log bash command and description to log file"""
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = read_hook_input()
         
         # Extract command and description from tool input
         tool_input = input_data.get('tool_input', {})
         command = tool_input.get('command', '')
         description = tool_input.get('description', 'No description')
         
-        # Get project directory
-        project_dir = Path(os.getenv('CLAUDE_PROJECT_DIR', Path.cwd()))
-        
         # Create logs directory if it doesn't exist
-        log_dir = project_dir / 'logs'
-        log_dir.mkdir(exist_ok=True)
-        
-        # Log file path
-        log_file = log_dir / 'bash-command-log.txt'
+        ensure_dir(LOG_DIR)
         
         # Format log entry with timestamp
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         log_entry = f"[{timestamp}] {command} - {description}\n"
         
-        # Append to log file
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        # Append to log file (O_APPEND keeps concurrent hook writes whole)
+        append_to_log(LOG_FILE, log_entry)
         
         # Exit successfully to allow command to proceed
         sys.exit(0)
@@ -46,8 +54,7 @@ def log_bash_command():
     except json.JSONDecodeError:
         # If JSON parsing fails, log error but don't block command
         try:
-            error_log = log_dir / 'bash-command-log-errors.txt'
-            with open(error_log, 'a') as f:
+            with open(ERROR_LOG_FILE, 'a') as f:
                 f.write(f"[{datetime.now()}] JSON decode error\n")
         except:
             pass
@@ -56,8 +63,7 @@ def log_bash_command():
     except Exception as e:
         # Log any other errors but don't block command
         try:
-            error_log = log_dir / 'bash-command-log-errors.txt'
-            with open(error_log, 'a') as f:
+            with open(ERROR_LOG_FILE, 'a') as f:
                 f.write(f"[{datetime.now()}] Error: {e}\n")
         except:
             pass
@@ -8,9 +8,13 @@ import os
 import re
 import sys
 import json
+import mmap
+import bisect
+import codecs
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
-from collections import defaultdict
+from typing import Iterator, List, Dict, Tuple, Optional
+from collections import Counter
 
 # Get project directory from environment or use current directory
 PROJECT_DIR = Path(os.environ.get('CLAUDE_PROJECT_DIR', Path.cwd()))
@@ -46,6 +50,22 @@ if sys.platform == 'win32' and not os.environ.get('ANSICON'):
     except:
         Colors.disable()
 
+def iter_markdown_files(root) -> Iterator[str]:
+    """Yield paths of all .md files under root using os.scandir's cached entry types"""
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.md'):
+                        # Like glob, yield dangling symlinks too so reading them reports an error
+                        yield entry.path
+        except OSError:
+            # Like glob, skip directories that can't be listed
+            continue
+
 class BusinessRuleValidator:
     """Validates business rules extraction quality"""
     
@@ -54,13 +74,25 @@ class BusinessRuleValidator:
     MIN_CRITICAL_RULES = 5
     MIN_CATEGORIES = 3
     
-    # Business rule patterns to search for
-    RULE_PATTERNS = [
-        r'BR-\d{3,}',  # BR-001, BR-002, etc.
-        r'Rule\s+ID\s*[:\|]',  # Rule ID in tables
-        r'\|\s*BR-\w+\s*\|',  # Rules in markdown tables
-        r'Business Rule\s*#?\d+',  # Business Rule #1, etc.
-    ]
+    # Business rule patterns to search for. These are bytes patterns so they
+    # can scan a memory-mapped file without decoding it first
+    RULE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in [
+        rb'BR-\d{3,}',  # BR-001, BR-002, etc.
+        rb'Rule\s+ID\s*[:\|]',  # Rule ID in tables
+        rb'\|\s*BR-\w+\s*\|',  # Rules in markdown tables
+        rb'Business Rule\s*#?\d+',  # Business Rule #1, etc.
+    ])
+    
+    # Patterns used while extracting rule details, compiled once
+    _NEWLINE_RE = re.compile(rb'\n')
+    _NON_ASCII_RE = re.compile(rb'[\x80-\xff]')
+    _UTF8_CHECK_CHUNK = 1 << 16
+    _RULE_ID_RE = re.compile(r'BR-\d{3,}|\bBR-\w+\b')
+    _CODE_REF_RE = re.compile(r'[\w/]+\.\w+:\d+|\w+\.java:\d+|\w+\.cs:\d+|\w+\.py:\d+')
+    _CLASS_RE = re.compile(r'\b[A-Z][a-zA-Z]+(?:Service|Controller|Manager|Repository|DAO)\b')
+    _ROW_SPLIT_RE = re.compile(r'\s*\|\s*')
+    _TABLE_RE = re.compile(rb'\|.*Rule\s*ID.*\|.*\n\|[-:\s|]+\n((?:\|.*\n)+)',
+                           re.IGNORECASE | re.MULTILINE)
     
     # Categories we expect to see
     EXPECTED_CATEGORIES = [
@@ -69,10 +101,53 @@ class BusinessRuleValidator:
         'authentication', 'financial', 'reporting', 'audit'
     ]
     
+    # Keyword -> (priority, category). Expected categories outrank the looser
+    # keyword fallbacks, preserving the order they were originally checked in
+    _CATEGORY_KEYWORDS = {
+        'validation': (0, 'validation'),
+        'authorization': (1, 'authorization'),
+        'calculation': (2, 'calculation'),
+        'business process': (3, 'business process'),
+        'data management': (4, 'data management'),
+        'compliance': (5, 'compliance'),
+        'workflow': (6, 'workflow'),
+        'constraint': (7, 'constraint'),
+        'authentication': (8, 'authentication'),
+        'financial': (9, 'financial'),
+        'reporting': (10, 'reporting'),
+        'audit': (11, 'audit'),
+        'validat': (12, 'validation'),
+        'auth': (13, 'authorization'),
+        'calculat': (14, 'calculation'),
+        'comput': (14, 'calculation'),
+        'process': (15, 'business process'),
+    }
+    _CRITICALITY_KEYWORDS = {
+        'critical': (0, 'Critical'),
+        'high': (1, 'High'),
+        'medium': (2, 'Medium'),
+        'important': (2, 'Medium'),
+        'low': (3, 'Low'),
+        'nice': (3, 'Low'),
+    }
+    # Longest keywords first so e.g. 'validation' wins over 'validat'
+    _CATEGORY_RE = re.compile(
+        '|'.join(map(re.escape, sorted(_CATEGORY_KEYWORDS, key=len, reverse=True))),
+        re.IGNORECASE | re.ASCII)
+    _CRITICALITY_RE = re.compile('|'.join(_CRITICALITY_KEYWORDS), re.IGNORECASE | re.ASCII)
+    
     def __init__(self):
         self.rules_found = []
-        self.rules_by_category = defaultdict(list)
-        self.rules_by_criticality = defaultdict(list)
+        # Category and criticality of each rule, kept in lockstep with
+        # rules_found (None when unknown) and tallied with Counter on demand
+        self.rule_categories = []
+        self.rule_criticalities = []
+        # Quality tallies maintained by record_rules as rules are added
+        self.rule_ids = set()
+        self.duplicate_ids = 0
+        self.rules_with_id = 0
+        self.rules_with_code_ref = 0
+        self.rules_with_desc = 0
         self.files_with_rules = []
         self.issues = []
         self.warnings = []
@@ -112,51 +187,128 @@ class BusinessRuleValidator:
     
     def extract_business_rules(self):
         """Extract business rules from all documentation"""
-        for md_file in OUTPUT_DIR.glob("**/*.md"):
-            rules_in_file = self.extract_rules_from_file(md_file)
-            if rules_in_file:
-                self.files_with_rules.append(md_file)
-                print(f"   Found {len(rules_in_file)} rules in {md_file.name}")
+        md_files = list(iter_markdown_files(OUTPUT_DIR))
+        if not md_files:
+            return
+        
+        # Files are scanned concurrently to overlap disk reads; workers only
+        # build rule lists and read errors, which are merged here in file order
+        max_workers = min(16, (os.cpu_count() or 1) * 2, len(md_files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for md_file, (rules_in_file, error) in zip(md_files, executor.map(self.extract_rules_from_file, md_files)):
+                if error:
+                    self.issues.append(error)
+                if rules_in_file:
+                    self.record_rules(rules_in_file)
+                    self.files_with_rules.append(md_file)
+                    print(f"   Found {len(rules_in_file)} rules in {os.path.basename(md_file)}")
+    
+    def record_rules(self, rules: List[Dict]):
+        """Add extracted rules to rules_found and the category, criticality and quality tallies"""
+        for rule_info in rules:
+            self.rules_found.append(rule_info)
+            rule_id = rule_info.get('id')
+            if rule_id:
+                self.rules_with_id += 1
+                if rule_id in self.rule_ids:
+                    self.duplicate_ids += 1
+                else:
+                    self.rule_ids.add(rule_id)
+            if rule_info.get('code_reference'):
+                self.rules_with_code_ref += 1
+            if rule_info.get('description') or rule_info.get('context'):
+                self.rules_with_desc += 1
+            self.rule_categories.append(rule_info.get('category'))
+            self.rule_criticalities.append(rule_info.get('criticality'))
+    
+    def rules_by_category(self) -> Counter:
+        """Number of rules per identified category"""
+        counts = Counter(self.rule_categories)
+        counts.pop(None, None)
+        return counts
     
-    def extract_rules_from_file(self, file_path: Path) -> List[Dict]:
-        """Extract business rules from a single file"""
+    def rules_by_criticality(self) -> Counter:
+        """Number of rules per identified criticality level"""
+        counts = Counter(self.rule_criticalities)
+        counts.pop(None, None)
+        return counts
+    
+    def extract_rules_from_file(self, file_path: str) -> Tuple[List[Dict], Optional[str]]:
+        """Extract business rules from a single file, returning (rules, read error or None)"""
         rules = []
+        filename = os.path.basename(file_path)
         
+        # Scan the file through a read-only memory map; only the context
+        # windows around matches are ever decoded
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return rules, None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    # Reject invalid UTF-8 as a text-mode read would
+                    self._check_utf8(content)
+                    self._scan_content(content, filename, rules)
         except Exception as e:
-            self.issues.append(f"Error reading {file_path.name}: {e}")
-            return rules
+            return rules, f"Error reading {filename}: {e}"
+        
+        return rules, None
+    
+    def _check_utf8(self, content: bytes):
+        """Raise UnicodeDecodeError if content is not valid UTF-8, without decoding it whole"""
+        # Everything before the first high byte is ASCII and always valid
+        first_high = self._NON_ASCII_RE.search(content)
+        if not first_high:
+            return
+        
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        size = len(content)
+        for start in range(first_high.start(), size, self._UTF8_CHECK_CHUNK):
+            end = start + self._UTF8_CHECK_CHUNK
+            # Bytes of a split character carried over from the previous chunk
+            pending = len(decoder.getstate()[0])
+            try:
+                decoder.decode(content[start:end], final=end >= size)
+            except UnicodeDecodeError as e:
+                # Report the position within the whole file, as a single decode would
+                offset = start - pending
+                raise UnicodeDecodeError(e.encoding, content[:offset + e.end],
+                                         offset + e.start, offset + e.end, e.reason) from None
+    
+    def _scan_content(self, content: bytes, filename: str, rules: List[Dict]):
+        """Collect rules from a file's raw bytes into rules"""
+        # Offsets of each line start, shared by every match in the file so
+        # context lookups never rescan it. Built on the first match only,
+        # so files without rules never pay for it
+        line_starts = None
         
         # Search for rule patterns
         for pattern in self.RULE_PATTERNS:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
+            for match in pattern.finditer(content):
+                if line_starts is None:
+                    line_starts = [0]
+                    line_starts.extend(m.end() for m in self._NEWLINE_RE.finditer(content))
                 # Try to extract the full rule context
-                rule_info = self.extract_rule_context(content, match.start())
+                rule_info = self.extract_rule_context(content, match.start(), line_starts)
                 if rule_info:
-                    rule_info['file'] = file_path.name
+                    rule_info['file'] = filename
                     rules.append(rule_info)
-                    self.rules_found.append(rule_info)
         
         # Also look for markdown tables with business rules
-        table_rules = self.extract_rules_from_tables(content, file_path.name)
-        rules.extend(table_rules)
-        self.rules_found.extend(table_rules)
-        
-        return rules
+        rules.extend(self.extract_rules_from_tables(content, filename))
     
-    def extract_rule_context(self, content: str, position: int) -> Optional[Dict]:
+    def extract_rule_context(self, content: bytes, position: int,
+                             line_starts: List[int]) -> Optional[Dict]:
         """Extract context around a business rule match"""
-        lines = content[:position].count('\n') + 1
+        lines = bisect.bisect_right(line_starts, position)
         
         # Get surrounding lines for context
-        all_lines = content.split('\n')
         start = max(0, lines - 2)
-        end = min(len(all_lines), lines + 3)
-        context_lines = all_lines[start:end]
-        context = '\n'.join(context_lines)
+        end = min(len(line_starts), lines + 3)
+        if end < len(line_starts):
+            context = content[line_starts[start]:line_starts[end] - 1]
+        else:
+            context = content[line_starts[start]:]
+        context = context.decode('utf-8').replace('\r\n', '\n').rstrip('\r')
         
         rule_info = {
             'line': lines,
@@ -164,7 +316,7 @@ class BusinessRuleValidator:
         }
         
         # Try to extract rule ID
-        rule_id_match = re.search(r'BR-\d{3,}|\bBR-\w+\b', context)
+        rule_id_match = self._RULE_ID_RE.search(context)
         if rule_id_match:
             rule_info['id'] = rule_id_match.group()
         
@@ -172,13 +324,11 @@ class BusinessRuleValidator:
         category = self.extract_category(context)
         if category:
             rule_info['category'] = category
-            self.rules_by_category[category].append(rule_info)
         
         # Try to extract criticality
         criticality = self.extract_criticality(context)
         if criticality:
             rule_info['criticality'] = criticality
-            self.rules_by_criticality[criticality].append(rule_info)
         
         # Try to extract code reference
         code_ref = self.extract_code_reference(context)
@@ -187,21 +337,19 @@ class BusinessRuleValidator:
         
         return rule_info
     
-    def extract_rules_from_tables(self, content: str, filename: str) -> List[Dict]:
+    def extract_rules_from_tables(self, content: bytes, filename: str) -> List[Dict]:
         """Extract business rules from markdown tables"""
         rules = []
         
         # Look for tables with Rule ID columns
-        table_pattern = r'\|.*Rule\s*ID.*\|.*\n\|[-:\s|]+\n((?:\|.*\n)+)'
-        table_matches = re.finditer(table_pattern, content, re.IGNORECASE | re.MULTILINE)
-        
-        for match in table_matches:
-            table_content = match.group(1)
+        for match in self._TABLE_RE.finditer(content):
+            table_content = match.group(1).decode('utf-8')
             rows = table_content.strip().split('\n')
             
             for row in rows:
                 if '|' in row:
-                    cells = [cell.strip() for cell in row.split('|')]
+                    # Splitting on the padded separator trims every cell in C
+                    cells = self._ROW_SPLIT_RE.split(row.strip())
                     if len(cells) > 2:  # At least ID and description
                         rule_info = {
                             'file': filename,
@@ -216,13 +364,11 @@ class BusinessRuleValidator:
                             criticality = self.extract_criticality(cells[4])
                             if criticality:
                                 rule_info['criticality'] = criticality
-                                self.rules_by_criticality[criticality].append(rule_info)
                         
                         # Categorize based on description
                         category = self.extract_category(rule_info.get('description', ''))
                         if category:
                             rule_info['category'] = category
-                            self.rules_by_category[category].append(rule_info)
                         
                         rules.append(rule_info)
         
@@ -230,51 +376,34 @@ class BusinessRuleValidator:
     
     def extract_category(self, text: str) -> Optional[str]:
         """Extract category from rule text"""
-        text_lower = text.lower()
-        
-        for category in self.EXPECTED_CATEGORIES:
-            if category in text_lower:
-                return category
-        
-        # Check for common keywords
-        if 'validat' in text_lower:
-            return 'validation'
-        elif 'auth' in text_lower:
-            return 'authorization'
-        elif 'calculat' in text_lower or 'comput' in text_lower:
-            return 'calculation'
-        elif 'process' in text_lower or 'workflow' in text_lower:
-            return 'business process'
-        
-        return None
+        return self._best_keyword_match(self._CATEGORY_RE, self._CATEGORY_KEYWORDS, text)
     
     def extract_criticality(self, text: str) -> Optional[str]:
         """Extract criticality level from rule text"""
-        text_lower = text.lower()
-        
-        if 'critical' in text_lower:
-            return 'Critical'
-        elif 'high' in text_lower:
-            return 'High'
-        elif 'medium' in text_lower or 'important' in text_lower:
-            return 'Medium'
-        elif 'low' in text_lower or 'nice' in text_lower:
-            return 'Low'
-        
-        return None
+        return self._best_keyword_match(self._CRITICALITY_RE, self._CRITICALITY_KEYWORDS, text)
+    
+    @staticmethod
+    def _best_keyword_match(pattern, keywords: Dict, text: str) -> Optional[str]:
+        """Scan text once and return the highest-priority keyword's label"""
+        best = None
+        for word in pattern.findall(text):
+            hit = keywords.get(word.lower())
+            if hit and (best is None or hit[0] < best[0]):
+                best = hit
+                if best[0] == 0:
+                    break
+        return best[1] if best else None
     
     def extract_code_reference(self, text: str) -> Optional[str]:
         """Extract code reference from rule text"""
         # Look for file:line patterns
-        code_ref_pattern = r'[\w/]+\.\w+:\d+|\w+\.java:\d+|\w+\.cs:\d+|\w+\.py:\d+'
-        match = re.search(code_ref_pattern, text)
+        match = self._CODE_REF_RE.search(text)
         
         if match:
             return match.group()
         
         # Look for class/method references
-        class_pattern = r'\b[A-Z][a-zA-Z]+(?:Service|Controller|Manager|Repository|DAO)\b'
-        match = re.search(class_pattern, text)
+        match = self._CLASS_RE.search(text)
         
         if match:
             return match.group()
@@ -286,122 +415,122 @@ class BusinessRuleValidator:
         total_rules = len(self.rules_found)
         
         # Check for unique IDs
-        rule_ids = [r.get('id') for r in self.rules_found if r.get('id')]
-        unique_ids = set(rule_ids)
-        
-        if len(rule_ids) != len(unique_ids):
-            self.issues.append(f"Duplicate rule IDs found ({len(rule_ids) - len(unique_ids)} duplicates)")
+        if self.duplicate_ids:
+            self.issues.append(f"Duplicate rule IDs found ({self.duplicate_ids} duplicates)")
         
         # Check for code references
-        rules_with_code_ref = [r for r in self.rules_found if r.get('code_reference')]
-        if len(rules_with_code_ref) < total_rules * 0.5:
-            self.warnings.append(f"Only {len(rules_with_code_ref)}/{total_rules} rules have code references")
+        if self.rules_with_code_ref < total_rules * 0.5:
+            self.warnings.append(f"Only {self.rules_with_code_ref}/{total_rules} rules have code references")
         
         # Check for descriptions
-        rules_with_desc = [r for r in self.rules_found if r.get('description') or r.get('context')]
-        if len(rules_with_desc) < total_rules * 0.8:
-            self.warnings.append(f"Only {len(rules_with_desc)}/{total_rules} rules have descriptions")
+        if self.rules_with_desc < total_rules * 0.8:
+            self.warnings.append(f"Only {self.rules_with_desc}/{total_rules} rules have descriptions")
     
     def check_completeness(self):
         """Check if business rule extraction is complete"""
+        out = []
         total_rules = len(self.rules_found)
         
         # Check minimum rules
         if total_rules < self.MIN_RULES_REQUIRED:
             self.issues.append(f"Only {total_rules} rules found (minimum {self.MIN_RULES_REQUIRED} required)")
-            print(f"   {Colors.RED}✗ Insufficient rules: {total_rules}/{self.MIN_RULES_REQUIRED}{Colors.NC}")
+            out.append(f"   {Colors.RED}✗ Insufficient rules: {total_rules}/{self.MIN_RULES_REQUIRED}{Colors.NC}")
         else:
-            print(f"   {Colors.GREEN}✓ Rule count: {total_rules} (exceeds minimum){Colors.NC}")
+            out.append(f"   {Colors.GREEN}✓ Rule count: {total_rules} (exceeds minimum){Colors.NC}")
         
         # Check critical rules
-        critical_rules = len(self.rules_by_criticality.get('Critical', []))
+        critical_rules = self.rules_by_criticality()['Critical']
         if critical_rules < self.MIN_CRITICAL_RULES:
             self.warnings.append(f"Only {critical_rules} critical rules (expected {self.MIN_CRITICAL_RULES}+)")
-            print(f"   {Colors.YELLOW}⚠ Critical rules: {critical_rules}/{self.MIN_CRITICAL_RULES}{Colors.NC}")
+            out.append(f"   {Colors.YELLOW}⚠ Critical rules: {critical_rules}/{self.MIN_CRITICAL_RULES}{Colors.NC}")
         else:
-            print(f"   {Colors.GREEN}✓ Critical rules: {critical_rules}{Colors.NC}")
+            out.append(f"   {Colors.GREEN}✓ Critical rules: {critical_rules}{Colors.NC}")
         
         # Check categories
-        num_categories = len(self.rules_by_category)
+        num_categories = len(self.rules_by_category())
         if num_categories < self.MIN_CATEGORIES:
             self.warnings.append(f"Only {num_categories} categories (expected {self.MIN_CATEGORIES}+)")
-            print(f"   {Colors.YELLOW}⚠ Categories: {num_categories}/{self.MIN_CATEGORIES}{Colors.NC}")
+            out.append(f"   {Colors.YELLOW}⚠ Categories: {num_categories}/{self.MIN_CATEGORIES}{Colors.NC}")
         else:
-            print(f"   {Colors.GREEN}✓ Categories: {num_categories}{Colors.NC}")
+            out.append(f"   {Colors.GREEN}✓ Categories: {num_categories}{Colors.NC}")
+        
+        sys.stdout.write('\n'.join(out) + '\n')
     
     def show_summary(self):
         """Display validation summary"""
-        print("\n" + "=" * 60)
-        print("Business Rule Validation Summary")
-        print("=" * 60)
+        # Collect every line and emit them with one write
+        out = []
+        out.append("\n" + "=" * 60)
+        out.append("Business Rule Validation Summary")
+        out.append("=" * 60)
         
         total_rules = len(self.rules_found)
+        rules_by_category = self.rules_by_category()
+        rules_by_criticality = self.rules_by_criticality()
         
         # Overall statistics
-        print(f"\n{Colors.CYAN}Statistics:{Colors.NC}")
-        print(f"   Total rules extracted: {total_rules}")
-        print(f"   Files with rules: {len(self.files_with_rules)}")
-        print(f"   Categories identified: {len(self.rules_by_category)}")
+        out.append(f"\n{Colors.CYAN}Statistics:{Colors.NC}")
+        out.append(f"   Total rules extracted: {total_rules}")
+        out.append(f"   Files with rules: {len(self.files_with_rules)}")
+        out.append(f"   Categories identified: {len(rules_by_category)}")
         
         # Criticality breakdown
-        if self.rules_by_criticality:
-            print(f"\n{Colors.CYAN}Rules by Criticality:{Colors.NC}")
+        if rules_by_criticality:
+            out.append(f"\n{Colors.CYAN}Rules by Criticality:{Colors.NC}")
             for level in ['Critical', 'High', 'Medium', 'Low']:
-                count = len(self.rules_by_criticality.get(level, []))
+                count = rules_by_criticality[level]
                 if count > 0:
-                    print(f"   {level}: {count}")
+                    out.append(f"   {level}: {count}")
         
         # Category breakdown
-        if self.rules_by_category:
-            print(f"\n{Colors.CYAN}Rules by Category:{Colors.NC}")
-            for category, rules in sorted(self.rules_by_category.items(), 
-                                         key=lambda x: len(x[1]), reverse=True)[:5]:
-                print(f"   {category.title()}: {len(rules)}")
+        if rules_by_category:
+            out.append(f"\n{Colors.CYAN}Rules by Category:{Colors.NC}")
+            for category, count in rules_by_category.most_common(5):
+                out.append(f"   {category.title()}: {count}")
         
         # Quality metrics
-        rules_with_code = len([r for r in self.rules_found if r.get('code_reference')])
-        rules_with_id = len([r for r in self.rules_found if r.get('id')])
-        
-        print(f"\n{Colors.CYAN}Quality Metrics:{Colors.NC}")
-        print(f"   Rules with IDs: {rules_with_id}/{total_rules}")
-        print(f"   Rules with code references: {rules_with_code}/{total_rules}")
+        out.append(f"\n{Colors.CYAN}Quality Metrics:{Colors.NC}")
+        out.append(f"   Rules with IDs: {self.rules_with_id}/{total_rules}")
+        out.append(f"   Rules with code references: {self.rules_with_code_ref}/{total_rules}")
         
         # Issues and warnings
         if self.issues:
-            print(f"\n{Colors.RED}Issues:{Colors.NC}")
+            out.append(f"\n{Colors.RED}Issues:{Colors.NC}")
             for issue in self.issues:
-                print(f"   • {issue}")
+                out.append(f"   • {issue}")
         
         if self.warnings:
-            print(f"\n{Colors.YELLOW}Warnings:{Colors.NC}")
+            out.append(f"\n{Colors.YELLOW}Warnings:{Colors.NC}")
             for warning in self.warnings:
-                print(f"   • {warning}")
+                out.append(f"   • {warning}")
         
         # Final verdict
         if total_rules >= self.MIN_RULES_REQUIRED:
-            print(f"\n{Colors.GREEN}✅ Business rule extraction meets minimum requirements!{Colors.NC}")
+            out.append(f"\n{Colors.GREEN}✅ Business rule extraction meets minimum requirements!{Colors.NC}")
             
-            print("\n💡 Recommendations:")
-            print("   • Review rules for accuracy and completeness")
-            print("   • Ensure all critical rules have code references")
-            print("   • Validate business logic with stakeholders")
-            print("   • Consider documenting edge cases")
+            out.append("\n💡 Recommendations:")
+            out.append("   • Review rules for accuracy and completeness")
+            out.append("   • Ensure all critical rules have code references")
+            out.append("   • Validate business logic with stakeholders")
+            out.append("   • Consider documenting edge cases")
         else:
-            print(f"\n{Colors.RED}❌ Business rule extraction incomplete!{Colors.NC}")
+            out.append(f"\n{Colors.RED}❌ Business rule extraction incomplete!{Colors.NC}")
             
-            print(f"\n{Colors.MAGENTA}Required Actions:{Colors.NC}")
-            print("   1. Run @business-logic-analyst agent")
-            print("   2. Ensure thorough code analysis")
-            print("   3. Extract rules from:")
-            print("      • Validation logic")
-            print("      • Business calculations")
-            print("      • Authorization checks")
-            print("      • Data constraints")
-            print("   4. Document each rule with:")
-            print("      • Unique ID (BR-XXX)")
-            print("      • Description")
-            print("      • Code reference (file:line)")
-            print("      • Criticality level")
+            out.append(f"\n{Colors.MAGENTA}Required Actions:{Colors.NC}")
+            out.append("   1. Run @business-logic-analyst agent")
+            out.append("   2. Ensure thorough code analysis")
+            out.append("   3. Extract rules from:")
+            out.append("      • Validation logic")
+            out.append("      • Business calculations")
+            out.append("      • Authorization checks")
+            out.append("      • Data constraints")
+            out.append("   4. Document each rule with:")
+            out.append("      • Unique ID (BR-XXX)")
+            out.append("      • Description")
+            out.append("      • Code reference (file:line)")
+            out.append("      • Criticality level")
+        
+        sys.stdout.write('\n'.join(out) + '\n')
 
 def main():
     """Main entry point"""
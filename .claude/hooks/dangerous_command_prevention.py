@@ -8,23 +8,64 @@ import json
 import sys
 import re
 import os
+import atexit
 from datetime import datetime
 from pathlib import Path
 
+from hook_utils import ensure_dir, read_hook_input
+
+# google-re2 is optional; its linear-time engine rules out catastrophic
+# backtracking in the pattern scans. Python's re is used otherwise
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# pyahocorasick is optional; it finds all trigger literals in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Log locations, resolved once at import
+LOG_DIR = Path(os.getenv('CLAUDE_PROJECT_DIR', '')) / 'logs'
+LOG_FILES = {
+    'allowed': LOG_DIR / 'security-allowed.log',
+    'security': LOG_DIR / 'security-blocked.log',
+}
+
+# Each hook run is one short-lived process, so its log lines share one timestamp
+RUN_TIMESTAMP = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+# Log lines queued during this hook run, written by flush_logs
+_LOG_BUFFER = {'allowed': [], 'security': []}
+
 
 def log_message(message, log_type='security'):
-    """Log security events to the appropriate log file"""
-    log_dir = Path(os.getenv('CLAUDE_PROJECT_DIR', '')) / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    
-    if log_type == 'allowed':
-        log_file = log_dir / 'security-allowed.log'
-    else:
-        log_file = log_dir / 'security-blocked.log'
-    
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    with open(log_file, 'a') as f:
-        f.write(f"[{timestamp}] DANGEROUS_COMMAND_PREVENTION: {message}\n")
+    """Queue a security event for the appropriate log file"""
+    buffer = _LOG_BUFFER['allowed' if log_type == 'allowed' else 'security']
+    buffer.append(f"[{RUN_TIMESTAMP}] DANGEROUS_COMMAND_PREVENTION: {message}\n")
+
+
+def flush_logs():
+    """Write queued log lines with one O_APPEND write per log file"""
+    for log_type, lines in _LOG_BUFFER.items():
+        if not lines:
+            continue
+        ensure_dir(LOG_DIR)
+        
+        # Single O_APPEND write: no Python buffering, concurrent hooks can't interleave
+        fd = os.open(LOG_FILES[log_type], os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, ''.join(lines).encode('utf-8'))
+        finally:
+            os.close(fd)
+        lines.clear()
+
+
+atexit.register(flush_logs)
 
 
 def get_dangerous_patterns():
@@ -100,9 +141,11 @@ def get_dangerous_patterns():
 
 def get_suspicious_patterns():
     """Define suspicious patterns that should trigger warnings"""
+    # Ordered by how often they fire in practice, most common first, so the
+    # fused alternation settles on a hit as early as possible
     return [
-        r'rm\s+-rf',
         r'sudo\s+',
+        r'rm\s+-rf',
         r'curl\s+.*\|\s*bash',
         r'wget\s+.*\|\s*bash',
         r'chmod\s+\+x\s+/tmp/',
@@ -142,100 +185,217 @@ def get_security_files():
     ]
 
 
-def check_dangerous_patterns(command):
-    """Check command against dangerous patterns"""
-    dangerous_patterns = get_dangerous_patterns()
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, command, re.IGNORECASE):
-            log_message(f"BLOCKED - Dangerous pattern detected - Command: {command} - Pattern: {pattern}", log_type='security')
-            print(f"SECURITY ALERT: Dangerous command blocked!", file=sys.stderr)
-            print(f"Command: {command}", file=sys.stderr)
-            print(f"Matched pattern: {pattern}", file=sys.stderr)
-            print("This command could cause system damage or security compromise.", file=sys.stderr)
-            print("If you need to run this command, please review it carefully and run it manually.", file=sys.stderr)
-            return False
-    
-    return True
+def _alternation(patterns):
+    """Join patterns into one alternation with a named group (p0, p1, ...) per pattern"""
+    return '|'.join(f'(?P<p{index}>{pattern})' for index, pattern in enumerate(patterns))
+
+
+def _matched_pattern(match, patterns):
+    """Map the named group that took part in a match back to its source pattern"""
+    return next(pattern for index, pattern in enumerate(patterns)
+                if match.group(f'p{index}') is not None)
+
+
+def _compile(pattern):
+    """Compile a case-insensitive pattern with re2 when available, else re"""
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile('(?i)' + pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, re.IGNORECASE)
+
+
+_DANGEROUS_SRC = tuple(get_dangerous_patterns())
+_SUSPICIOUS_SRC = tuple(get_suspicious_patterns())
+_CRITICAL_DIR_SRC = (
+    r'(?:rm|mv|cp|chmod|chown).*(?P<directory>'
+    + '|'.join(re.escape(directory) for directory in get_critical_directories())
+    + ')'
+)
+_SECURITY_FILE_SRC = (
+    r'(?:rm|mv|cp|chmod|chown|echo.*>|cat.*>).*(?P<file_path>'
+    + '|'.join(re.escape(file_path) for file_path in get_security_files())
+    + ')'
+)
+_CHAINING_SRC = r';\s*(?:rm|dd|mkfs|fdisk)'
+
+# Every blocking rule is fused into one regex compiled at import, so a hook
+# run scans the command once; the named group that matched tells which
+# rule fired
+_BLOCKING = _compile('|'.join([
+    _alternation(_DANGEROUS_SRC),
+    f'(?P<critical_dir>{_CRITICAL_DIR_SRC})',
+    f'(?P<security_file>{_SECURITY_FILE_SRC})',
+    f'(?P<chaining>{_CHAINING_SRC})',
+]))
+_SUSPICIOUS = _compile(_alternation(_SUSPICIOUS_SRC))
+_ENV_MANIPULATION = _compile(r'(export|unset)\s+(PATH|LD_LIBRARY_PATH|HOME)')
+
+# Literal fragments that every blocking and warning pattern above requires.
+# A command containing none of them cannot match any check, so the regex
+# scans are skipped entirely. Keep this in sync when adding patterns.
+_TRIGGERS = (
+    'rm', 'mv', 'cp', 'chmod', 'chown', 'echo', 'cat', 'passwd', 'su', 'ssh',
+    'curl', 'wget', 'bash', 'dd', 'mkfs', 'fdisk', 'parted', 'kill',
+    'systemctl', 'service', 'crontab', 'apt-get', 'yum', 'brew', 'mount',
+    'history', 'unset', 'export', 'iptables', 'ufw', 'modprobe', 'nohup',
+    '/dev/null',
+)
+
+
+if AHOCORASICK_AVAILABLE:
+    _TRIGGER_AUTOMATON = ahocorasick.Automaton()
+    for _trigger in _TRIGGERS:
+        _TRIGGER_AUTOMATON.add_word(_trigger, _trigger)
+    _TRIGGER_AUTOMATON.make_automaton()
+else:
+    _TRIGGER_RE = re.compile('|'.join(re.escape(trigger) for trigger in _TRIGGERS))
+
+
+def _has_trigger(command):
+    """Cheap literal pre-filter: True if any pattern could possibly match"""
+    folded = command.casefold()
+    if AHOCORASICK_AVAILABLE:
+        return next(_TRIGGER_AUTOMATON.iter(folded), None) is not None
+    return _TRIGGER_RE.search(folded) is not None
+
 
+# Commands that only read or create files and cannot run other programs.
+# Interpreters, build tools, find/xargs and friends are deliberately absent
+# since their arguments can smuggle in anything the patterns look for.
+_SAFE_COMMANDS = frozenset({
+    'ls', 'pwd', 'cd', 'echo', 'cat', 'head', 'tail', 'wc', 'grep',
+    'diff', 'which', 'mkdir', 'touch', 'true', 'false', 'date', 'whoami',
+})
 
-def check_suspicious_patterns(command):
-    """Check command against suspicious patterns (warnings only)"""
-    suspicious_patterns = get_suspicious_patterns()
+# Read-only subcommands of otherwise unrestricted tools
+_SAFE_SUBCOMMANDS = {
+    'git': frozenset({'status', 'diff'}),
+}
+
+# Shell operators that can chain, redirect or substitute commands
+_SHELL_OPERATORS = frozenset('|;&<>`$\n\r')
+
+
+def _is_known_safe(command):
+    """True for a plain invocation of a safe command with no shell operators"""
+    parts = command.split(None, 2)
+    if not parts or not _SHELL_OPERATORS.isdisjoint(command):
+        return False
+    if parts[0] in _SAFE_COMMANDS:
+        return True
+    return len(parts) > 1 and parts[1] in _SAFE_SUBCOMMANDS.get(parts[0], ())
+
+
+def classify_command(command):
+    """Classify a command without side effects
     
-    for pattern in suspicious_patterns:
-        if re.search(pattern, command, re.IGNORECASE):
-            log_message(f"WARNING - Suspicious pattern detected but allowed - Command: {command} - Pattern: {pattern}", log_type='allowed')
-            print(f"WARNING: Potentially risky command detected:", file=sys.stderr)
-            print(f"Command: {command}", file=sys.stderr)
-            print(f"Matched pattern: {pattern}", file=sys.stderr)
-            print("Please review this command carefully.", file=sys.stderr)
-            print("Continuing execution...", file=sys.stderr)
-            break
-
-
-def check_critical_directories(command):
-    """Check if command targets critical system directories"""
-    critical_dirs = get_critical_directories()
+    Returns (rule, detail, warnings). rule names the blocking rule that fired
+    ('dangerous', 'critical_dir', 'security_file' or 'chaining') and detail
+    what it matched, or both are None when the command is allowed. warnings
+    is a tuple of (rule, detail) pairs for the warning-only rules that fired.
+    """
+    # Skip the regex checks for known-safe commands and for commands
+    # that no pattern could possibly match
+    if _is_known_safe(command) or not _has_trigger(command):
+        return None, None, ()
     
-    for directory in critical_dirs:
-        pattern = rf'(rm|mv|cp|chmod|chown).*{re.escape(directory)}'
-        if re.search(pattern, command, re.IGNORECASE):
-            log_message(f"BLOCKED - Critical directory access - Command: {command} - Directory: {directory}", log_type='security')
-            print(f"SECURITY ALERT: Command targets critical system directory!", file=sys.stderr)
-            print(f"Command: {command}", file=sys.stderr)
-            print(f"Critical directory: {directory}", file=sys.stderr)
-            print("This operation could compromise system stability.", file=sys.stderr)
-            return False
+    # Dangerous patterns, critical directory and security file access, and
+    # command chaining are all checked by one scan (blocking)
+    match = _BLOCKING.search(command)
+    if match:
+        if match.group('critical_dir') is not None:
+            return 'critical_dir', match.group('directory'), ()
+        if match.group('security_file') is not None:
+            return 'security_file', match.group('file_path'), ()
+        if match.group('chaining') is not None:
+            return 'chaining', None, ()
+        return 'dangerous', _matched_pattern(match, _DANGEROUS_SRC), ()
     
-    return True
+    # Suspicious patterns and environment manipulation (warnings only)
+    warnings = []
+    match = _SUSPICIOUS.search(command)
+    if match:
+        warnings.append(('suspicious', _matched_pattern(match, _SUSPICIOUS_SRC)))
+    if _ENV_MANIPULATION.search(command):
+        warnings.append(('environment', None))
+    
+    return None, None, tuple(warnings)
 
 
-def check_security_files(command):
-    """Check if command targets security-related files"""
-    security_files = get_security_files()
-    
-    for file_path in security_files:
-        # Escape special regex characters in file path
-        escaped_path = re.escape(file_path)
-        pattern = rf'(rm|mv|cp|chmod|chown|echo.*>|cat.*>).*{escaped_path}'
-        if re.search(pattern, command, re.IGNORECASE):
-            log_message(f"BLOCKED - Security file access - Command: {command} - File: {file_path}", log_type='security')
-            print(f"SECURITY ALERT: Command targets security-sensitive file!", file=sys.stderr)
-            print(f"Command: {command}", file=sys.stderr)
-            print(f"Security file: {file_path}", file=sys.stderr)
-            print("This operation could compromise system security.", file=sys.stderr)
-            return False
-    
-    return True
+def block_dangerous_pattern(command, pattern):
+    """Report a command that matched a dangerous pattern"""
+    log_message(f"BLOCKED - Dangerous pattern detected - Command: {command} - Pattern: {pattern}", log_type='security')
+    print(f"SECURITY ALERT: Dangerous command blocked!", file=sys.stderr)
+    print(f"Command: {command}", file=sys.stderr)
+    print(f"Matched pattern: {pattern}", file=sys.stderr)
+    print("This command could cause system damage or security compromise.", file=sys.stderr)
+    print("If you need to run this command, please review it carefully and run it manually.", file=sys.stderr)
+    return False
 
 
-def check_command_chaining(command):
-    """Check for dangerous command chaining"""
-    chaining_pattern = r';\s*(rm|dd|mkfs|fdisk)'
-    if re.search(chaining_pattern, command, re.IGNORECASE):
-        log_message(f"BLOCKED - Dangerous command chaining - Command: {command}", log_type='security')
-        print("SECURITY ALERT: Dangerous command chaining detected!", file=sys.stderr)
-        print(f"Command: {command}", file=sys.stderr)
-        print("Command chaining with destructive operations is not allowed.", file=sys.stderr)
-        return False
-    
-    return True
+def block_critical_directory(command, directory):
+    """Report a command that targets a critical system directory"""
+    log_message(f"BLOCKED - Critical directory access - Command: {command} - Directory: {directory}", log_type='security')
+    print(f"SECURITY ALERT: Command targets critical system directory!", file=sys.stderr)
+    print(f"Command: {command}", file=sys.stderr)
+    print(f"Critical directory: {directory}", file=sys.stderr)
+    print("This operation could compromise system stability.", file=sys.stderr)
+    return False
+
 
+def block_security_file(command, file_path):
+    """Report a command that targets a security-related file"""
+    log_message(f"BLOCKED - Security file access - Command: {command} - File: {file_path}", log_type='security')
+    print(f"SECURITY ALERT: Command targets security-sensitive file!", file=sys.stderr)
+    print(f"Command: {command}", file=sys.stderr)
+    print(f"Security file: {file_path}", file=sys.stderr)
+    print("This operation could compromise system security.", file=sys.stderr)
+    return False
 
-def check_environment_manipulation(command):
-    """Check for potentially dangerous environment variable manipulation"""
-    env_pattern = r'(export|unset)\s+(PATH|LD_LIBRARY_PATH|HOME)'
-    if re.search(env_pattern, command, re.IGNORECASE):
-        log_message(f"WARNING - Environment manipulation allowed - Command: {command}", log_type='allowed')
-        print("WARNING: Environment variable manipulation detected:", file=sys.stderr)
-        print(f"Command: {command}", file=sys.stderr)
-        print("Modifying system environment variables can affect security.", file=sys.stderr)
+
+def block_command_chaining(command, _detail=None):
+    """Report dangerous command chaining"""
+    log_message(f"BLOCKED - Dangerous command chaining - Command: {command}", log_type='security')
+    print("SECURITY ALERT: Dangerous command chaining detected!", file=sys.stderr)
+    print(f"Command: {command}", file=sys.stderr)
+    print("Command chaining with destructive operations is not allowed.", file=sys.stderr)
+    return False
+
+
+def warn_suspicious_pattern(command, pattern):
+    """Report a suspicious pattern (warning only)"""
+    log_message(f"WARNING - Suspicious pattern detected but allowed - Command: {command} - Pattern: {pattern}", log_type='allowed')
+    print(f"WARNING: Potentially risky command detected:", file=sys.stderr)
+    print(f"Command: {command}", file=sys.stderr)
+    print(f"Matched pattern: {pattern}", file=sys.stderr)
+    print("Please review this command carefully.", file=sys.stderr)
+    print("Continuing execution...", file=sys.stderr)
+
+
+def warn_environment_manipulation(command, _detail=None):
+    """Report potentially dangerous environment variable manipulation (warning only)"""
+    log_message(f"WARNING - Environment manipulation allowed - Command: {command}", log_type='allowed')
+    print("WARNING: Environment variable manipulation detected:", file=sys.stderr)
+    print(f"Command: {command}", file=sys.stderr)
+    print("Modifying system environment variables can affect security.", file=sys.stderr)
+
+
+# Reporter for each rule name returned by classify_command
+_REPORTERS = {
+    'dangerous': block_dangerous_pattern,
+    'critical_dir': block_critical_directory,
+    'security_file': block_security_file,
+    'chaining': block_command_chaining,
+    'suspicious': warn_suspicious_pattern,
+    'environment': warn_environment_manipulation,
+}
 
 
 def validate_command(command):
     """Main validation function for bash commands"""
-    if not command:
+    if not command or command.isspace():
         # Empty commands are allowed but logged
         log_message("Empty command - allowed", log_type='allowed')
         return True
@@ -243,27 +403,12 @@ def validate_command(command):
     # Log command analysis start
     log_message(f"Analyzing command: {command}", log_type='allowed')
     
-    # Check for dangerous patterns (blocking)
-    if not check_dangerous_patterns(command):
-        return False
-    
-    # Check for critical directory access (blocking)
-    if not check_critical_directories(command):
-        return False
-    
-    # Check for security file access (blocking)
-    if not check_security_files(command):
-        return False
-    
-    # Check for command chaining (blocking)
-    if not check_command_chaining(command):
-        return False
-    
-    # Check for suspicious patterns (warnings only)
-    check_suspicious_patterns(command)
+    rule, detail, warnings = classify_command(command)
+    if rule:
+        return _REPORTERS[rule](command, detail)
     
-    # Check for environment manipulation (warnings only)
-    check_environment_manipulation(command)
+    for warning, warning_detail in warnings:
+        _REPORTERS[warning](command, warning_detail)
     
     # Command passed all checks - log as allowed
     log_message(f"ALLOWED - Command passed all security checks - Command: {command}", log_type='allowed')
@@ -273,7 +418,7 @@ def validate_command(command):
 def main():
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = read_hook_input()
         
         # Extract command from tool input
         tool_input = input_data.get('tool_input', {})
@@ -283,7 +428,8 @@ def main():
         if validate_command(command):
             sys.exit(0)  # Allow command
         else:
-            # Command was blocked - already logged in validate_command
+            # Command was blocked - write the security log before exiting
+            flush_logs()
             sys.exit(2)  # Block command
     
     except json.JSONDecodeError:
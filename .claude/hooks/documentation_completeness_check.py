@@ -5,15 +5,23 @@ Ensures all required documentation files are generated
 """
 
 import os
+import re
+import mmap
 import sys
 import json
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 # Get project directory from environment or use current directory
 PROJECT_DIR = Path(os.environ.get('CLAUDE_PROJECT_DIR', Path.cwd()))
 OUTPUT_DIR = PROJECT_DIR / "output" / "docs"
 
+# Business rule markers: BR- identifiers or rule table headers
+BUSINESS_RULE_PATTERN = re.compile(rb'BR-\d+|Rule ID.*\|')
+
+# Opening fence of an embedded Mermaid diagram
+MERMAID_FENCE_PATTERN = re.compile(re.escape(b'```mermaid'))
+
 class Colors:
     """Terminal colors"""
     RED = '\033[0;31m'
@@ -36,11 +44,16 @@ class Colors:
 # Enable colors on Windows if possible
 if sys.platform == 'win32' and not os.environ.get('ANSICON'):
     try:
-        import ctypes
-        kernel32 = ctypes.windll.kernel32
-        kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
-    except:
-        Colors.disable()
+        # colorama (optional) enables ANSI handling without loading ctypes.windll
+        from colorama import just_fix_windows_console
+        just_fix_windows_console()
+    except ImportError:
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
+        except:
+            Colors.disable()
 
 class DocumentationChecker:
     """Checks documentation completeness"""
@@ -91,6 +104,13 @@ class DocumentationChecker:
         }
     ]
     
+    # Case-insensitive matcher per required section, so files need no lowercased copy
+    SECTION_PATTERNS = {
+        section: re.compile(re.escape(section.encode('utf-8')), re.IGNORECASE)
+        for doc_info in REQUIRED_DOCS
+        for section in doc_info['required_sections']
+    }
+    
     # Optional but recommended files
     OPTIONAL_DOCS = [
         '07-technical-architecture-specification.md',
@@ -103,12 +123,25 @@ class DocumentationChecker:
         '14-developer-onboarding-documentation.md'
     ]
     
+    # Agent responsible for each doc, keyed by the doc's two-digit number
+    AGENT_BY_NUMBER = {
+        '00': ('00-executive-summary', 'documentation-specialist'),
+        '01': ('01-archaeological-analysis', 'legacy-code-detective'),
+        '02': ('02-business-logic-analysis', 'business-logic-analyst'),
+        '03': ('03-visual-architecture', 'diagram-architect'),
+        '04': ('04-comprehensive-performance', 'performance-analyst'),
+        '05': ('05-comprehensive-security', 'security-analyst'),
+        '06': ('06-modernization-strategy', 'modernization-architect')
+    }
+    
     def __init__(self):
         self.missing_files = []
         self.incomplete_files = []
         self.complete_files = []
         self.optional_found = []
         self.warnings = []
+        self._doc_counts = None
+        self._doc_entries = None
     
     def run(self) -> int:
         """Main checking routine"""
@@ -150,15 +183,23 @@ class DocumentationChecker:
     
     def check_required_docs(self):
         """Check for required documentation files"""
+        entries = self.output_entries()
         for doc_info in self.REQUIRED_DOCS:
-            file_path = OUTPUT_DIR / doc_info['file']
+            entry = entries.get(doc_info['file'])
+            
+            # Check file size; a dangling symlink can't be stat'ed and counts as missing
+            file_size = None
+            if entry is not None:
+                try:
+                    file_size = entry.stat().st_size
+                except OSError:
+                    pass
             
-            if not file_path.exists():
+            if file_size is None:
                 self.missing_files.append(doc_info)
                 print(f"   {Colors.RED}✗ Missing: {doc_info['file']}{Colors.NC}")
             else:
-                # Check file size
-                file_size = file_path.stat().st_size
+                file_path = Path(entry.path)
                 if file_size < doc_info['min_size']:
                     self.incomplete_files.append({
                         'file': doc_info['file'],
@@ -180,46 +221,62 @@ class DocumentationChecker:
     
     def check_optional_docs(self):
         """Check for optional documentation files"""
+        entries = self.output_entries()
         for doc_file in self.OPTIONAL_DOCS:
-            file_path = OUTPUT_DIR / doc_file
-            
-            if file_path.exists():
+            if doc_file in entries:
                 self.optional_found.append(doc_file)
                 print(f"   {Colors.GREEN}✓ Found: {doc_file}{Colors.NC}")
             else:
                 print(f"   {Colors.BLUE}ℹ Optional: {doc_file}{Colors.NC}")
     
+    def output_entries(self) -> Dict[str, os.DirEntry]:
+        """Map names in the output directory to their entries, listing it once"""
+        if self._doc_entries is None:
+            with os.scandir(OUTPUT_DIR) as it:
+                self._doc_entries = {entry.name: entry for entry in it}
+        
+        return self._doc_entries
+    
     def check_sections(self, file_path: Path, required_sections: List[str]) -> List[str]:
         """Check if file contains required sections"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().lower()
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                missing = []
+                for section in required_sections:
+                    pattern = self.SECTION_PATTERNS.get(section) or \
+                        re.compile(re.escape(section.encode('utf-8')), re.IGNORECASE)
+                    if not pattern.search(content):
+                        missing.append(section)
         except Exception:
             return required_sections
         
-        missing = []
-        for section in required_sections:
-            if section.lower() not in content:
-                missing.append(section)
-        
         return missing
     
+    def scan_docs(self) -> Tuple[int, int]:
+        """Count business rules and Mermaid blocks in the docs, reading each file once"""
+        if self._doc_counts is None:
+            business_rules = 0
+            diagrams = 0
+            for entry in self.output_entries().values():
+                if not entry.name.endswith('.md'):
+                    continue
+                try:
+                    # Scan the mapped file directly rather than reading it into memory
+                    with open(entry.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        # Count business rules (look for BR- patterns or rule tables)
+                        business_rules += len(BUSINESS_RULE_PATTERN.findall(content))
+                        diagrams += len(MERMAID_FENCE_PATTERN.findall(content))
+                except Exception:
+                    # Unreadable or empty files (mmap rejects zero length) contribute nothing
+                    continue
+            self._doc_counts = (business_rules, diagrams)
+        
+        return self._doc_counts
+    
     def check_business_rules(self):
         """Check for business rules extraction"""
-        business_rules_found = 0
-        
         # Check all documentation for business rules
-        for md_file in OUTPUT_DIR.glob("*.md"):
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Count business rules (look for BR- patterns or rule tables)
-                import re
-                br_patterns = len(re.findall(r'BR-\d+|Rule ID.*\|', content))
-                business_rules_found += br_patterns
-            except Exception:
-                pass
+        business_rules_found, _ = self.scan_docs()
         
         if business_rules_found == 0:
             self.warnings.append("No business rules found (expected 50+)")
@@ -232,17 +289,10 @@ class DocumentationChecker:
     
     def check_diagrams(self):
         """Check for diagram generation"""
-        diagram_count = 0
         diagram_dir = PROJECT_DIR / "output" / "diagrams"
         
         # Check in documentation files
-        for md_file in OUTPUT_DIR.glob("*.md"):
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    diagram_count += content.count('```mermaid')
-            except Exception:
-                pass
+        _, diagram_count = self.scan_docs()
         
         # Check diagram directory
         if diagram_dir.exists():
@@ -320,19 +370,10 @@ class DocumentationChecker:
     
     def get_agent_for_doc(self, filename: str) -> str:
         """Get the agent responsible for generating a document"""
-        agent_map = {
-            '00-executive-summary': 'documentation-specialist',
-            '01-archaeological-analysis': 'legacy-code-detective',
-            '02-business-logic-analysis': 'business-logic-analyst',
-            '03-visual-architecture': 'diagram-architect',
-            '04-comprehensive-performance': 'performance-analyst',
-            '05-comprehensive-security': 'security-analyst',
-            '06-modernization-strategy': 'modernization-architect'
-        }
-        
-        for key, agent in agent_map.items():
-            if filename.startswith(key):
-                return agent
+        # Doc prefixes are unique in their two-digit number, so one lookup finds the candidate
+        candidate = self.AGENT_BY_NUMBER.get(filename[:2])
+        if candidate and filename.startswith(candidate[0]):
+            return candidate[1]
         
         return 'documentation-specialist'
 
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Claude Code hooks
+Hooks run as scripts from this directory, so they import this module directly
+"""
+
+import json
+import sys
+
+# orjson is optional; it parses the hook payload faster than the json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Directories already created by this process, so repeat logs skip the mkdir syscall
+_ENSURED_DIRS = set()
+
+
+def ensure_dir(path):
+    """Create path once per process; later calls are a set lookup"""
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+def read_hook_input():
+    """Read the hook's JSON payload from stdin in a single binary read"""
+    raw = sys.stdin.buffer.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
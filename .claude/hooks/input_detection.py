@@ -5,35 +5,49 @@ Detects when Claude might be waiting for user input based on patterns
 """
 
 import sys
-import json
 import os
+import re
 import subprocess
 from pathlib import Path
 
-def detect_input_prompt(context):
+from hook_utils import read_hook_input
+
+# Patterns that indicate Claude is asking for user confirmation
+INPUT_PATTERNS = [
+    "do you want to proceed",
+    "would you like me to",
+    "should i continue",
+    "confirm your choice",
+    "please select",
+    "choose an option",
+    "ready to continue",
+    "approve this",
+    "exitplanmode",  # When exiting plan mode
+    "shall i",
+    "may i proceed"
+]
+
+# All input patterns as one case-insensitive alternation
+_PROMPT_RE = re.compile("|".join(re.escape(p) for p in INPUT_PATTERNS), re.IGNORECASE)
+
+def iter_strings(obj):
+    """Yield every string in a parsed JSON value, including object keys"""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield key
+            yield from iter_strings(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from iter_strings(item)
+
+def detect_input_prompt(input_data):
     """
     Detect patterns that suggest Claude is waiting for user input
     """
-    # Patterns that indicate Claude is asking for user confirmation
-    input_patterns = [
-        "do you want to proceed",
-        "would you like me to",
-        "should i continue",
-        "confirm your choice",
-        "please select",
-        "choose an option",
-        "ready to continue",
-        "approve this",
-        "exitplanmode",  # When exiting plan mode
-        "shall i",
-        "may i proceed"
-    ]
-    
-    # Check if context suggests waiting for input
+    # Check if the hook payload suggests waiting for input
     try:
-        # Read from stdin if available
-        input_data = json.load(sys.stdin)
-        
         # Check tool name and context
         tool_name = input_data.get('tool', '').lower()
         
@@ -41,12 +55,10 @@ def detect_input_prompt(context):
         if tool_name == 'exitplanmode':
             return True
         
-        # Check for patterns in parameters or context
-        params_str = json.dumps(input_data.get('parameters', {})).lower()
-        
-        for pattern in input_patterns:
-            if pattern in params_str:
-                return True
+        # Check for patterns in the string values of parameters or context
+        params = input_data.get('parameters', {})
+        if any(_PROMPT_RE.search(text) for text in iter_strings(params)):
+            return True
                 
     except Exception:
         pass
@@ -58,17 +70,25 @@ def send_notification():
     notification_script = Path(os.getenv('CLAUDE_PROJECT_DIR', '')) / '.claude' / 'hooks' / 'notifications.py'
     
     if notification_script.exists():
-        subprocess.run([
+        # Detach the notifier so the hook returns without waiting for it
+        subprocess.Popen([
             sys.executable,
             str(notification_script),
             "Claude is waiting for your input",
             "--title", "Action Required",
             "--method", "all"
-        ], capture_output=True)
+        ], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True)
 
 def main():
     """Main entry point"""
-    if detect_input_prompt(sys.stdin):
+    # Read the hook payload from stdin once; treat unreadable input as empty
+    try:
+        input_data = read_hook_input()
+    except Exception:
+        input_data = {}
+    
+    if detect_input_prompt(input_data):
         send_notification()
     
     # Always allow the tool to proceed
@@ -7,9 +7,8 @@ Message is passed via command line argument or environment variable
 
 import sys
 import os
+import atexit
 import platform
-import subprocess
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -18,24 +17,46 @@ from typing import Optional
 class NotificationSystem:
     """Cross-platform notification system"""
     
+    # Linux text-to-speech command, probed once per process ('' when none is installed)
+    _VOICE_BACKEND = None
+    
     def __init__(self):
         self.system = platform.system()
         self.project_dir = Path(os.getenv('CLAUDE_PROJECT_DIR', Path.cwd()))
         self.log_dir = self.project_dir / 'logs'
         self.log_dir.mkdir(exist_ok=True)
         self.notification_log = self.log_dir / 'notifications.log'
+        self._sapi_voice = None
+        self._log_file = None
     
     def log_notification(self, message: str, method: str):
         """Log notification to file"""
         try:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            with open(self.notification_log, 'a', encoding='utf-8') as f:
-                f.write(f"[{timestamp}] [{method}] {message}\n")
+            # Open once and keep it; line buffering still writes each entry immediately
+            if self._log_file is None:
+                self._log_file = open(self.notification_log, 'a', buffering=1, encoding='utf-8')
+                atexit.register(self._log_file.close)
+            self._log_file.write(f"[{timestamp}] [{method}] {message}\n")
         except Exception:
             pass  # Silent fail for logging
     
+    def get_sapi_voice(self):
+        """Get an in-process Windows SAPI voice via pywin32, or None if unavailable"""
+        if self._sapi_voice is None:
+            try:
+                import win32com.client
+                self._sapi_voice = win32com.client.Dispatch("SAPI.SpVoice")
+            except Exception:
+                self._sapi_voice = False
+        return self._sapi_voice or None
+    
     def send_voice(self, message: str) -> bool:
         """Send voice notification (text-to-speech)"""
+        # Imported here so terminal-only notifications don't pay for them
+        import shutil
+        import subprocess
+        
         try:
             if self.system == "Darwin":  # macOS
                 subprocess.run(["say", message], check=False, capture_output=True)
@@ -43,12 +64,23 @@ class NotificationSystem:
                 return True
             
             elif self.system == "Windows":
-                # Windows PowerShell text-to-speech
-                ps_command = f'Add-Type -AssemblyName System.Speech; ' \
-                           f'$speak = New-Object System.Speech.Synthesis.SpeechSynthesizer; ' \
-                           f'$speak.Speak("{message}")'
+                # Speak through SAPI in-process when pywin32 is installed; synchronous,
+                # since this process exits right after and would cut off async speech
+                voice = self.get_sapi_voice()
+                if voice is not None:
+                    voice.Speak(message)
+                    self.log_notification(message, "VOICE")
+                    return True
+                
+                # Otherwise fall back to PowerShell text-to-speech. The message goes in
+                # through the environment, so quotes or backticks in it can't break
+                # the command, and -NoProfile skips loading the user's profile
+                ps_command = 'Add-Type -AssemblyName System.Speech; ' \
+                           '$speak = New-Object System.Speech.Synthesis.SpeechSynthesizer; ' \
+                           '$speak.Speak($env:NOTIFICATION_MESSAGE)'
                 subprocess.run(
-                    ["powershell", "-Command", ps_command],
+                    ["powershell", "-NoProfile", "-Command", ps_command],
+                    env={**os.environ, 'NOTIFICATION_MESSAGE': message},
                     check=False,
                     capture_output=True
                 )
@@ -56,12 +88,20 @@ class NotificationSystem:
                 return True
             
             elif self.system == "Linux":
-                # Try espeak first, then festival
-                if subprocess.run(["which", "espeak"], capture_output=True).returncode == 0:
+                # Try espeak first, then festival; shutil.which scans PATH without forking
+                if NotificationSystem._VOICE_BACKEND is None:
+                    if shutil.which("espeak"):
+                        NotificationSystem._VOICE_BACKEND = "espeak"
+                    elif shutil.which("festival"):
+                        NotificationSystem._VOICE_BACKEND = "festival"
+                    else:
+                        NotificationSystem._VOICE_BACKEND = ""
+                
+                if NotificationSystem._VOICE_BACKEND == "espeak":
                     subprocess.run(["espeak", message], check=False, capture_output=True)
                     self.log_notification(message, "VOICE")
                     return True
-                elif subprocess.run(["which", "festival"], capture_output=True).returncode == 0:
+                elif NotificationSystem._VOICE_BACKEND == "festival":
                     subprocess.run(
                         ["festival", "--tts"],
                         input=message.encode(),
@@ -79,6 +119,8 @@ class NotificationSystem:
     
     def send_popup(self, message: str, title: str = "Claude Code") -> bool:
         """Send popup/desktop notification"""
+        import subprocess
+        
         try:
             if self.system == "Darwin":  # macOS
                 # Use osascript for native macOS notifications
@@ -174,6 +216,8 @@ def get_message_from_args() -> tuple[str, str]:
     if not message:
         # Try reading from stdin (for hook compatibility)
         try:
+            import json
+            
             # Read JSON from stdin if available
             input_data = json.load(sys.stdin)
             # Ignore the JSON data, just use as trigger
@@ -184,11 +228,8 @@ def get_message_from_args() -> tuple[str, str]:
     return message, args.title, args.method
 
 
-def main():
-    """Main entry point for notification system"""
-    # Get message and settings
-    message, title, method = get_message_from_args()
-    
+def notify(message: str, title: str = "Claude Code", method: str = "all") -> bool:
+    """Send a notification by the given method; other hooks import this to skip a subprocess"""
     # Initialize notification system
     notifier = NotificationSystem()
     
@@ -208,6 +249,15 @@ def main():
         notifier.send_terminal(message)
         success = True
     
+    return success
+
+
+def main():
+    """Main entry point for notification system"""
+    # Get message and settings
+    message, title, method = get_message_from_args()
+    
+    notify(message, title, method)
     sys.exit(0)
 
 
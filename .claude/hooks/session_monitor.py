@@ -6,12 +6,36 @@ Best used with UserPromptSubmit hook
 """
 
 import sys
+import io
 import json
 import os
 import subprocess
 import re
+import contextlib
+import time
 from pathlib import Path
-from datetime import datetime
+
+# Interactive prompt patterns
+INTERACTIVE_PATTERNS = [
+    r"Do you want to proceed\?",
+    r"❯\s+\d+\.\s+Yes",  # Claude's interactive prompt format
+    r"❯\s+\d+\.\s+No",
+    r"Please (choose|select)",
+    r"Would you like",
+    r"Shall I",
+    r"Ready to (continue|proceed)",
+    r"Confirm your",
+    r"Enter your",
+    r"Type 'yes' to confirm"
+]
+
+# All prompt patterns as one alternation, so a response is scanned once
+INTERACTIVE_PROMPT_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in INTERACTIVE_PATTERNS), re.IGNORECASE
+)
+
+# Prompts for input come at the end of a response, so only this many trailing characters are scanned
+RESPONSE_TAIL_CHARS = 2048
 
 class SessionMonitor:
     """Monitor Claude session for interaction patterns"""
@@ -20,26 +44,16 @@ class SessionMonitor:
         self.project_dir = Path(os.getenv('CLAUDE_PROJECT_DIR', Path.cwd()))
         self.state_file = self.project_dir / '.claude' / '.session_state'
         self.notification_script = self.project_dir / '.claude' / 'hooks' / 'notifications.py'
+        try:
+            self.state_file.parent.mkdir(exist_ok=True)
+        except OSError:
+            pass
     
     def check_for_input_request(self):
         """
         Check if Claude's recent output suggests waiting for input
         This would need to hook into Claude's output stream
         """
-        # Interactive prompt patterns
-        interactive_patterns = [
-            r"Do you want to proceed\?",
-            r"❯\s+\d+\.\s+Yes",  # Claude's interactive prompt format
-            r"❯\s+\d+\.\s+No",
-            r"Please (choose|select)",
-            r"Would you like",
-            r"Shall I",
-            r"Ready to (continue|proceed)",
-            r"Confirm your",
-            r"Enter your",
-            r"Type 'yes' to confirm"
-        ]
-        
         try:
             # Try to read recent output from stdin
             input_data = json.load(sys.stdin)
@@ -47,10 +61,9 @@ class SessionMonitor:
             # Get Claude's last response if available
             response = input_data.get('response', '')
             
-            # Check for interactive patterns
-            for pattern in interactive_patterns:
-                if re.search(pattern, response, re.IGNORECASE):
-                    return True
+            # Check for interactive patterns near the end of the response
+            if INTERACTIVE_PROMPT_RE.search(response[-RESPONSE_TAIL_CHARS:]):
+                return True
                     
         except Exception:
             pass
@@ -59,7 +72,15 @@ class SessionMonitor:
     
     def send_notification(self, message="Claude is waiting for your response"):
         """Send notification"""
-        if self.notification_script.exists():
+        if not self.notification_script.exists():
+            return
+        
+        # Call the notification hook in-process rather than starting another interpreter
+        try:
+            sys.path.insert(0, str(self.notification_script.parent))
+            from notifications import notify
+        except Exception:
+            # Fall back to running it as a script
             subprocess.run([
                 sys.executable,
                 str(self.notification_script),
@@ -67,17 +88,28 @@ class SessionMonitor:
                 "--title", "Input Required",
                 "--method", "all"
             ], capture_output=True)
+            return
+        
+        # Keep its terminal fallback quiet, as capturing the script's output did
+        try:
+            with contextlib.redirect_stderr(io.StringIO()):
+                notify(message, title="Input Required", method="all")
+        except Exception:
+            pass
     
     def update_state(self, waiting=False):
         """Track session state"""
         try:
             state = {
-                'timestamp': datetime.now().isoformat(),
+                # Seconds since the epoch; datetime.fromtimestamp() gives the ISO form when read
+                'timestamp': time.time(),
                 'waiting_for_input': waiting
             }
-            self.state_file.parent.mkdir(exist_ok=True)
-            with open(self.state_file, 'w') as f:
+            # Write a temp file and swap it in, so readers never see a partial state
+            tmp_file = self.state_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
                 json.dump(state, f)
+            os.replace(tmp_file, self.state_file)
         except Exception:
             pass
 
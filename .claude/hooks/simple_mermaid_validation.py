@@ -9,45 +9,58 @@ import re
 import json
 from pathlib import Path
 
+# ```mermaid or ```mmd code blocks in markdown
+MERMAID_BLOCK_PATTERN = re.compile(r'```(?:mermaid|mmd)\s*\n(.*?)\n```', re.DOTALL)
+
+# Whitespace at the end of each line; [^\S\n] is the set str.rstrip() strips, minus the line break
+TRAILING_WHITESPACE_PATTERN = re.compile(r'[^\S\n]+$', re.MULTILINE)
+
+# Safe fixes applied after trailing whitespace is handled, as (compiled pattern, replacement)
+SAFE_FIXES = [
+    # 3. Fix comment indentation (comments must start at column 1)
+    (re.compile(r'^[ \t]+(%%.*)$', re.MULTILINE), r'\1'),
+    # 4. Fix multiple spaces after colons in Notes
+    (re.compile(r'(Note\s+(?:over|right of|left of)\s+[^:]+:)\s{2,}'), r'\1 '),
+    # 5. Remove @ symbols from stereotypes
+    (re.compile(r'<<@(\w+)>>'), r'<<\1>>'),
+    # 6. Reduce excessive blank lines (max 2 consecutive)
+    (re.compile(r'\n{3,}'), '\n\n'),
+]
+
+# Keywords a diagram may start with, as a tuple so str.startswith checks them all in one call
+VALID_DIAGRAM_STARTS = (
+    'graph', 'flowchart', 'sequenceDiagram', 'classDiagram', 
+    'stateDiagram', 'stateDiagram-v2', 'erDiagram', 'journey', 
+    'gantt', 'pie', 'gitGraph', 'mindmap', 'timeline', 'quadrantChart',
+    'sankey', 'block-beta', 'C4Context', 'C4Container', 'C4Component', 'C4Dynamic'
+)
+
 def extract_mermaid_from_content(content: str, file_path: str) -> list:
     """Extract Mermaid diagrams from content"""
-    diagrams = []
-    
     # For .mmd files, entire content is a diagram
     if file_path.endswith('.mmd'):
-        diagrams.append(content)
-    else:
-        # For .md files, extract from code blocks
-        pattern = r'```(?:mermaid|mmd)\s*\n(.*?)\n```'
-        diagrams.extend(re.findall(pattern, content, re.DOTALL))
+        return [content]
     
-    return diagrams
+    # For .md files, extract from code blocks; without a fence there is nothing to match
+    if '```' not in content:
+        return []
+    return MERMAID_BLOCK_PATTERN.findall(content)
 
 def apply_safe_fixes(content: str) -> str:
     """
     Apply only the safest fixes that document-viewer.html handles well
     These are the same transformations the browser applies
     """
-    # 1. Remove trailing whitespace from lines
-    lines = content.split('\n')
-    lines = [line.rstrip() for line in lines]
-    content = '\n'.join(lines)
+    # 1. Remove trailing whitespace from lines in one pass
+    content = TRAILING_WHITESPACE_PATTERN.sub('', content)
     
     # 2. Ensure file ends with newline
     if content and not content.endswith('\n'):
         content += '\n'
     
-    # 3. Fix comment indentation (comments must start at column 1)
-    content = re.sub(r'^[ \t]+(%%.*)$', r'\1', content, flags=re.MULTILINE)
-    
-    # 4. Fix multiple spaces after colons in Notes
-    content = re.sub(r'(Note\s+(?:over|right of|left of)\s+[^:]+:)\s{2,}', r'\1 ', content)
-    
-    # 5. Remove @ symbols from stereotypes
-    content = re.sub(r'<<@(\w+)>>', r'<<\1>>', content)
-    
-    # 6. Reduce excessive blank lines (max 2 consecutive)
-    content = re.sub(r'\n{3,}', '\n\n', content)
+    # 3-6. Comment indentation, Note spacing, stereotype @ symbols, blank lines
+    for pattern, replacement in SAFE_FIXES:
+        content = pattern.sub(replacement, content)
     
     return content
 
@@ -61,19 +74,12 @@ def validate_basic_syntax(diagram: str) -> tuple:
         return False, "Empty diagram"
     
     # Check for valid diagram type at the start
-    valid_starts = [
-        'graph', 'flowchart', 'sequenceDiagram', 'classDiagram', 
-        'stateDiagram', 'stateDiagram-v2', 'erDiagram', 'journey', 
-        'gantt', 'pie', 'gitGraph', 'mindmap', 'timeline', 'quadrantChart',
-        'sankey', 'block-beta', 'C4Context', 'C4Container', 'C4Component', 'C4Dynamic'
-    ]
-    
     first_line = diagram.strip().split('\n')[0].strip()
     # Remove comments from first line
     if '%%' in first_line:
         first_line = first_line.split('%%')[0].strip()
     
-    if first_line and not any(first_line.startswith(start) for start in valid_starts):
+    if first_line and not first_line.startswith(VALID_DIAGRAM_STARTS):
         # Allow if first line is a comment
         if not first_line.startswith('%%'):
             return False, f"Invalid diagram type: {first_line[:50]}"
@@ -96,11 +102,27 @@ def validate_basic_syntax(diagram: str) -> tuple:
     
     return True, "Valid"
 
+def check_content(content: str, file_path: str) -> tuple:
+    """
+    Apply safe fixes, then extract and validate the diagrams
+    Returns (fixed_content, diagram_count, errors)
+    """
+    fixed_content = apply_safe_fixes(content)
+    diagrams = extract_mermaid_from_content(fixed_content, file_path)
+    
+    errors = []
+    for i, diagram in enumerate(diagrams):
+        is_valid, error = validate_basic_syntax(diagram)
+        if not is_valid:
+            errors.append(f"Diagram {i+1}: {error}")
+    
+    return fixed_content, len(diagrams), errors
+
 def main():
     """Main validation function called by Claude Code hook"""
     # Read input from stdin (Claude Code provides file path and content)
     try:
-        input_data = json.loads(sys.stdin.read())
+        input_data = json.load(sys.stdin)
         file_path = input_data.get('file_path', '')
         content = input_data.get('content', '')
     except:
@@ -119,13 +141,10 @@ def main():
         print(json.dumps({'valid': True}))
         sys.exit(0)
     
-    # Apply safe fixes
-    fixed_content = apply_safe_fixes(content)
-    
-    # Extract and validate diagrams
-    diagrams = extract_mermaid_from_content(fixed_content, file_path)
+    # Apply safe fixes, then extract and validate diagrams
+    fixed_content, diagram_count, errors = check_content(content, file_path)
     
-    if not diagrams and file_path.endswith('.mmd'):
+    if not diagram_count and file_path.endswith('.mmd'):
         print(json.dumps({
             'valid': False,
             'error': 'Empty Mermaid diagram file',
@@ -133,12 +152,6 @@ def main():
         }))
         sys.exit(1)
     
-    errors = []
-    for i, diagram in enumerate(diagrams):
-        is_valid, error = validate_basic_syntax(diagram)
-        if not is_valid:
-            errors.append(f"Diagram {i+1}: {error}")
-    
     if errors:
         print(json.dumps({
             'valid': False,
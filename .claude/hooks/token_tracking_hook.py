@@ -25,24 +25,35 @@ def extract_agent_name(context):
     # This would need to be adapted based on how Claude Code passes context
     return context.get("agent", "unknown")
 
+# Base token estimates per tool name
+TOOL_ESTIMATES = {
+    "Read": 500,  # Average file read
+    "Write": 200,  # Average file write
+    "Grep": 300,  # Search operation
+    "Glob": 100,  # File listing
+    "Bash": 150,  # Command execution
+    "WebSearch": 1000,  # Web content
+}
+
+# Serena MCP tools are named mcp__serena__<tool>, so they are matched by prefix
+SERENA_TOOL_PREFIX = "mcp__serena"
+SERENA_ESTIMATE = 200  # MCP call
+
+# Tool arguments that name the file, directory or command a tool touches
+SOURCE_ARG_KEYS = ("file_path", "path", "command", "pattern")
+
 def estimate_from_tool_use(tool_name, args):
     """Estimate tokens based on tool usage"""
-    estimates = {
-        "Read": 500,  # Average file read
-        "Write": 200,  # Average file write
-        "Grep": 300,  # Search operation
-        "Glob": 100,  # File listing
-        "Bash": 150,  # Command execution
-        "mcp__serena": 200,  # MCP call
-        "WebSearch": 1000,  # Web content
-    }
-    
-    base_estimate = estimates.get(tool_name, 100)
+    if tool_name.startswith(SERENA_TOOL_PREFIX):
+        base_estimate = SERENA_ESTIMATE
+    else:
+        base_estimate = TOOL_ESTIMATES.get(tool_name, 100)
     
     # Adjust based on arguments
     if "content" in args:
         base_estimate += estimate_tokens(args["content"])
-    if "file_path" in args and "repomix" in str(args.get("file_path", "")).lower():
+    file_path = args.get("file_path")
+    if isinstance(file_path, str) and "repomix" in file_path.lower():
         # Repomix files are large but efficient
         base_estimate = base_estimate * 0.2
     
@@ -50,15 +61,57 @@ def estimate_from_tool_use(tool_name, args):
 
 def determine_data_source(tool_name, args):
     """Determine data source from tool usage"""
-    if "repomix" in str(args).lower():
+    # Only the arguments naming what is accessed are inspected, never file content
+    targets = " ".join(
+        value for value in (args.get(key) for key in SOURCE_ARG_KEYS)
+        if isinstance(value, str)
+    )
+    if "repomix" in targets.lower():
         return "repomix"
-    elif tool_name.startswith("mcp__serena"):
+    elif tool_name.startswith(SERENA_TOOL_PREFIX):
         return "serena"
-    elif "codebase/" in str(args):
+    elif "codebase/" in targets:
         return "raw"
     else:
         return ""
 
+# Running token total and the total that triggers the next summary, kept between hook runs
+SUMMARY_STATE_FILE = Path("output/reports/token-tracking-state.json")
+SUMMARY_INTERVAL = 10000
+
+def load_summary_state():
+    """Load the running total and next summary threshold, or None on the first run"""
+    try:
+        with open(SUMMARY_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def show_periodic_summary(new_tokens):
+    """Print a token update each time the running total passes another 10k tokens"""
+    summary = None
+    state = load_summary_state()
+    if state is None:
+        # First run: seed the running total from the full usage history
+        total = get_token_summary().get("overall", {}).get("total_tokens", 0)
+        next_summary_at = (total // SUMMARY_INTERVAL + 1) * SUMMARY_INTERVAL
+    else:
+        total = state["running_total"] + new_tokens
+        next_summary_at = state["next_summary_at"]
+        if total >= next_summary_at:
+            summary = get_token_summary()
+            # Resync with the log, which may include tokens tracked outside this hook
+            total = summary.get("overall", {}).get("total_tokens", total)
+            next_summary_at = (total // SUMMARY_INTERVAL + 1) * SUMMARY_INTERVAL
+    
+    with open(SUMMARY_STATE_FILE, 'w') as f:
+        json.dump({"running_total": total, "next_summary_at": next_summary_at}, f)
+    
+    if summary and "overall" in summary:
+        efficiency = summary["overall"]["efficiency_score"]
+        budget_used = summary["overall"]["budget_used"]
+        print(f"\n📊 Token Update: {total:,} used ({budget_used}), Efficiency: {efficiency}%")
+
 def main():
     """Main hook execution"""
     # Read hook context (this would be provided by Claude Code)
@@ -66,12 +119,13 @@ def main():
     try:
         # Claude Code might pass context via stdin or environment
         if not sys.stdin.isatty():
-            context = json.loads(sys.stdin.read())
+            context = json.load(sys.stdin)
     except:
         pass
     
     # Get current agent
     agent = extract_agent_name(context)
+    new_tokens = 0
     
     # Check for tool usage patterns in recent output
     if "tool_use" in context:
@@ -94,20 +148,15 @@ def main():
             phase=f"Tool: {tool_name}",
             data_source=data_source
         )
+        new_tokens = input_tokens + output_tokens
         
         # Alert if using raw codebase
         if data_source == "raw":
             print(f"⚠️ Raw codebase access detected in {tool_name}")
             print("   Consider using Repomix for better efficiency")
     
-    # Periodic summary (every 10 operations)
-    summary = get_token_summary()
-    if summary and "overall" in summary:
-        total = summary["overall"]["total_tokens"]
-        if total > 0 and total % 10000 < 1000:  # Every 10k tokens
-            efficiency = summary["overall"]["efficiency_score"]
-            budget_used = summary["overall"]["budget_used"]
-            print(f"\n📊 Token Update: {total:,} used ({budget_used}), Efficiency: {efficiency}%")
+    # Periodic summary (every 10k tokens)
+    show_periodic_summary(new_tokens)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,11 +7,19 @@ Assists with planning and executing agent workflows for codebase analysis
 import os
 import sys
 import json
+import heapq
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 
+# Framework locations, resolved once from this script's path
+SCRIPT_DIR = Path(__file__).parent.resolve()
+FRAMEWORK_DIR = SCRIPT_DIR.parent
+PROJECT_ROOT = FRAMEWORK_DIR.parent
+AGENTS_DIR = PROJECT_ROOT / ".claude" / "agents"
+
 class Colors:
     """Terminal colors (cross-platform)"""
     RED = '\033[91m'
@@ -38,9 +46,24 @@ class Colors:
     @staticmethod
     def disable():
         """Disable colors"""
-        for attr in dir(Colors):
-            if not attr.startswith('_') and attr.isupper():
-                setattr(Colors, attr, '')
+        Colors.RED = ''
+        Colors.GREEN = ''
+        Colors.YELLOW = ''
+        Colors.BLUE = ''
+        Colors.MAGENTA = ''
+        Colors.CYAN = ''
+        Colors.RESET = ''
+        Colors.BOLD = ''
+        Colors.DIM = ''
+
+
+def scan_dir(path: Path) -> Optional[Dict[str, os.DirEntry]]:
+    """List a directory once as {name: DirEntry}, or None if it can't be read"""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name: entry for entry in entries}
+    except OSError:
+        return None
 
 
 class AnalysisPhase(Enum):
@@ -78,10 +101,10 @@ class AgentOrchestrator:
     """Orchestrates agent execution workflow"""
     
     def __init__(self):
-        self.script_dir = Path(__file__).parent.resolve()
-        self.framework_dir = self.script_dir.parent
-        self.project_root = self.framework_dir.parent
-        self.agents_dir = self.project_root / ".claude" / "agents"
+        self.script_dir = SCRIPT_DIR
+        self.framework_dir = FRAMEWORK_DIR
+        self.project_root = PROJECT_ROOT
+        self.agents_dir = AGENTS_DIR
         self.context_dir = self.project_root / "output" / "context"
         
         # Enable colors
@@ -100,6 +123,14 @@ class AgentOrchestrator:
         # Filter agents based on analysis mode
         self.filter_agents_by_mode()
         
+        # Index dependencies once the agent set is final
+        self.build_dependency_graph()
+        
+        # Group agents by phase once for the display methods
+        self._agents_by_phase = defaultdict(list)
+        for agent in self.agents.values():
+            self._agents_by_phase[agent.phase].append(agent)
+        
         # Initialize context management
         self.context_summaries = {}
         
@@ -208,6 +239,19 @@ class AgentOrchestrator:
         
         return agents
     
+    def build_dependency_graph(self):
+        """Precompute dependency counts and dependents for execution planning"""
+        self._indegree = {name: 0 for name in self.agents}
+        self._children = {name: [] for name in self.agents}
+        for name, agent in self.agents.items():
+            for dep in agent.dependencies:
+                if dep in self.agents:
+                    self._indegree[name] += 1
+                    self._children[dep].append(name)
+        
+        # Definition order breaks ties, so independent agents follow the workflow order
+        self._rank = {name: i for i, name in enumerate(self.agents)}
+    
     def get_analysis_mode(self) -> str:
         """Get the configured analysis mode"""
         analysis_mode_file = self.project_root / "ANALYSIS_MODE.md"
@@ -317,40 +361,45 @@ class AgentOrchestrator:
     
     def show_workflow(self):
         """Display the complete workflow"""
-        print(f"\n{Colors.CYAN}{Colors.BOLD}{'=' * 70}{Colors.RESET}")
-        print(f"{Colors.CYAN}{Colors.BOLD}AGENT ORCHESTRATION WORKFLOW{Colors.RESET}")
-        print(f"{Colors.CYAN}{'=' * 70}{Colors.RESET}")
-        print(f"{Colors.MAGENTA}Analysis Mode: {self.analysis_mode}{Colors.RESET}")
-        print(f"{Colors.MAGENTA}Documentation Mode: {self.documentation_mode}{Colors.RESET}")
+        # Collected and written in one go rather than one print() per line
+        lines = []
+        
+        lines.append(f"\n{Colors.CYAN}{Colors.BOLD}{'=' * 70}{Colors.RESET}")
+        lines.append(f"{Colors.CYAN}{Colors.BOLD}AGENT ORCHESTRATION WORKFLOW{Colors.RESET}")
+        lines.append(f"{Colors.CYAN}{'=' * 70}{Colors.RESET}")
+        lines.append(f"{Colors.MAGENTA}Analysis Mode: {self.analysis_mode}{Colors.RESET}")
+        lines.append(f"{Colors.MAGENTA}Documentation Mode: {self.documentation_mode}{Colors.RESET}")
         
         if self.documentation_mode == "QUICK":
-            print(f"{Colors.YELLOW}Note: Running in QUICK mode - fully automated, no user interaction{Colors.RESET}")
+            lines.append(f"{Colors.YELLOW}Note: Running in QUICK mode - fully automated, no user interaction{Colors.RESET}")
         elif self.documentation_mode == "GUIDED":
-            print(f"{Colors.GREEN}Note: Running in GUIDED mode - will prompt for input at key points{Colors.RESET}")
+            lines.append(f"{Colors.GREEN}Note: Running in GUIDED mode - will prompt for input at key points{Colors.RESET}")
         elif self.documentation_mode == "TEMPLATE":
-            print(f"{Colors.BLUE}Note: Running in TEMPLATE mode - will generate templates for completion{Colors.RESET}")
+            lines.append(f"{Colors.BLUE}Note: Running in TEMPLATE mode - will generate templates for completion{Colors.RESET}")
         
-        print()
+        lines.append("")
         
         for phase in self.workflow_phases:
-            phase_agents = [a for a in self.agents.values() if a.phase == phase]
+            phase_agents = self._agents_by_phase.get(phase)
             if phase_agents:
-                print(f"{Colors.BLUE}{Colors.BOLD}Phase {phase.value}:{Colors.RESET}")
-                print(f"{Colors.DIM}{'─' * 60}{Colors.RESET}")
+                lines.append(f"{Colors.BLUE}{Colors.BOLD}Phase {phase.value}:{Colors.RESET}")
+                lines.append(f"{Colors.DIM}{'─' * 60}{Colors.RESET}")
                 
                 for agent in phase_agents:
                     status_icon = self.get_status_icon(agent.status)
-                    print(f"  {status_icon} {Colors.YELLOW}@{agent.name}{Colors.RESET}")
-                    print(f"     {Colors.DIM}{agent.description}{Colors.RESET}")
+                    lines.append(f"  {status_icon} {Colors.YELLOW}@{agent.name}{Colors.RESET}")
+                    lines.append(f"     {Colors.DIM}{agent.description}{Colors.RESET}")
                     
                     if agent.dependencies:
                         deps = ", ".join([f"@{d}" for d in agent.dependencies])
-                        print(f"     {Colors.DIM}Depends on: {deps}{Colors.RESET}")
+                        lines.append(f"     {Colors.DIM}Depends on: {deps}{Colors.RESET}")
                     
                     if agent.outputs:
-                        print(f"     {Colors.DIM}Outputs: {', '.join(agent.outputs)}{Colors.RESET}")
+                        lines.append(f"     {Colors.DIM}Outputs: {', '.join(agent.outputs)}{Colors.RESET}")
                     
-                    print()
+                    lines.append("")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def get_status_icon(self, status: str) -> str:
         """Get status icon for agent"""
@@ -368,40 +417,51 @@ class AgentOrchestrator:
         if not target_agents:
             target_agents = list(self.agents.keys())
         
-        # Topological sort for dependency resolution
-        visited = set()
+        # Collect the targets and everything they depend on
+        required = set()
+        pending = [name for name in target_agents if name in self.agents]
+        while pending:
+            agent_name = pending.pop()
+            if agent_name not in required:
+                required.add(agent_name)
+                pending.extend(dep for dep in self.agents[agent_name].dependencies if dep in self.agents)
+        
+        # Topological sort (Kahn's algorithm): schedule agents whose dependencies are all scheduled
+        indegree = {name: self._indegree[name] for name in required}
+        ready = [(self._rank[name], name) for name in required if indegree[name] == 0]
+        heapq.heapify(ready)
         execution_order = []
         
-        def visit(agent_name: str):
-            if agent_name in visited:
-                return
-            
-            agent = self.agents.get(agent_name)
-            if not agent:
-                return
-            
-            # Visit dependencies first
-            for dep in agent.dependencies:
-                visit(dep)
-            
-            visited.add(agent_name)
+        while ready:
+            _, agent_name = heapq.heappop(ready)
             execution_order.append(agent_name)
+            for child in self._children[agent_name]:
+                if child in indegree:
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        heapq.heappush(ready, (self._rank[child], child))
         
-        for agent_name in target_agents:
-            visit(agent_name)
+        # Agents left unscheduled are in, or depend on, a dependency cycle
+        if len(execution_order) < len(required):
+            unscheduled = sorted(required - set(execution_order), key=self._rank.get)
+            raise ValueError(f"Dependency cycle blocks agents: {', '.join('@' + name for name in unscheduled)}")
         
         return execution_order
     
     def show_execution_plan(self, plan: List[str]):
         """Display execution plan"""
-        print(f"\n{Colors.GREEN}{Colors.BOLD}EXECUTION PLAN{Colors.RESET}")
-        print(f"{Colors.DIM}{'─' * 60}{Colors.RESET}\n")
+        lines = []
+        
+        lines.append(f"\n{Colors.GREEN}{Colors.BOLD}EXECUTION PLAN{Colors.RESET}")
+        lines.append(f"{Colors.DIM}{'─' * 60}{Colors.RESET}\n")
         
         for i, agent_name in enumerate(plan, 1):
             agent = self.agents[agent_name]
-            print(f"{Colors.CYAN}{i:2d}.{Colors.RESET} {Colors.YELLOW}@{agent_name}{Colors.RESET}")
-            print(f"    Phase: {agent.phase.value}")
-            print(f"    {Colors.DIM}{agent.description}{Colors.RESET}")
+            lines.append(f"{Colors.CYAN}{i:2d}.{Colors.RESET} {Colors.YELLOW}@{agent_name}{Colors.RESET}")
+            lines.append(f"    Phase: {agent.phase.value}")
+            lines.append(f"    {Colors.DIM}{agent.description}{Colors.RESET}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def generate_commands(self, plan: List[str]) -> List[str]:
         """Generate Claude Code commands for agent execution"""
@@ -430,43 +490,49 @@ class AgentOrchestrator:
     
     def check_prerequisites(self) -> Tuple[bool, List[str]]:
         """Check if all prerequisites are met"""
+        lines = []
         issues = []
         
-        print(f"\n{Colors.YELLOW}{Colors.BOLD}PREREQUISITE CHECK{Colors.RESET}")
-        print(f"{Colors.DIM}{'─' * 60}{Colors.RESET}\n")
+        lines.append(f"\n{Colors.YELLOW}{Colors.BOLD}PREREQUISITE CHECK{Colors.RESET}")
+        lines.append(f"{Colors.DIM}{'─' * 60}{Colors.RESET}\n")
+        
+        # One listing per directory answers the existence checks below
+        root_entries = scan_dir(self.project_root) or {}
         
         # Check .mcp.json
-        if not (self.project_root / ".mcp.json").exists():
+        if ".mcp.json" not in root_entries:
             issues.append("Missing .mcp.json - Run setup script first")
-            print(f"{Colors.RED}❌ .mcp.json not found{Colors.RESET}")
+            lines.append(f"{Colors.RED}❌ .mcp.json not found{Colors.RESET}")
         else:
-            print(f"{Colors.GREEN}✅ .mcp.json exists{Colors.RESET}")
+            lines.append(f"{Colors.GREEN}✅ .mcp.json exists{Colors.RESET}")
         
         # Check agents directory
-        if not self.agents_dir.exists():
+        agent_entries = scan_dir(self.agents_dir)
+        if agent_entries is None:
             issues.append("Missing .claude/agents directory")
-            print(f"{Colors.RED}❌ Agents directory not found{Colors.RESET}")
+            lines.append(f"{Colors.RED}❌ Agents directory not found{Colors.RESET}")
         else:
-            agent_files = list(self.agents_dir.glob("*.md"))
-            print(f"{Colors.GREEN}✅ Found {len(agent_files)} agent definitions{Colors.RESET}")
+            agent_count = sum(1 for name in agent_entries if name.endswith(".md"))
+            lines.append(f"{Colors.GREEN}✅ Found {agent_count} agent definitions{Colors.RESET}")
         
         # Check output directories
-        output_dirs = ["output/docs", "output/diagrams", "output/reports"]
-        for dir_path in output_dirs:
-            full_path = self.project_root / dir_path
-            if not full_path.exists():
-                full_path.mkdir(parents=True, exist_ok=True)
-                print(f"{Colors.YELLOW}📁 Created {dir_path}{Colors.RESET}")
+        output_entries = scan_dir(self.project_root / "output") or {}
+        output_dirs = ["docs", "diagrams", "reports"]
+        for dir_name in output_dirs:
+            if dir_name not in output_entries:
+                (self.project_root / "output" / dir_name).mkdir(parents=True, exist_ok=True)
+                lines.append(f"{Colors.YELLOW}📁 Created output/{dir_name}{Colors.RESET}")
         
         # Check codebase
-        codebase_dir = self.project_root / "codebase"
-        if not codebase_dir.exists() or not list(codebase_dir.iterdir()):
+        codebase_entries = scan_dir(self.project_root / "codebase")
+        if not codebase_entries:
             issues.append("No codebase found in codebase/ directory")
-            print(f"{Colors.RED}❌ No codebase to analyze{Colors.RESET}")
+            lines.append(f"{Colors.RED}❌ No codebase to analyze{Colors.RESET}")
         else:
-            projects = [d.name for d in codebase_dir.iterdir() if d.is_dir()]
-            print(f"{Colors.GREEN}✅ Found projects: {', '.join(projects)}{Colors.RESET}")
+            projects = [name for name, entry in codebase_entries.items() if entry.is_dir()]
+            lines.append(f"{Colors.GREEN}✅ Found projects: {', '.join(projects)}{Colors.RESET}")
         
+        sys.stdout.write("\n".join(lines) + "\n")
         return len(issues) == 0, issues
     
     def interactive_mode(self):
@@ -476,7 +542,7 @@ class AgentOrchestrator:
         
         # Group agents by phase
         for phase in self.workflow_phases:
-            phase_agents = [a for a in self.agents.values() if a.phase == phase]
+            phase_agents = self._agents_by_phase.get(phase)
             if phase_agents:
                 print(f"\n{Colors.BLUE}{phase.value}:{Colors.RESET}")
                 for agent in phase_agents:
@@ -510,24 +576,28 @@ class AgentOrchestrator:
     def save_plan(self, plan: List[str]):
         """Save execution plan to file"""
         plan_file = self.project_root / "output" / "analysis_plan.json"
-        plan_data = {
-            "generated": datetime.now().isoformat(),
-            "agents": plan,
-            "phases": {}
-        }
         
+        # Group planned agents by phase, in plan order
+        phases = defaultdict(list)
         for agent_name in plan:
             agent = self.agents[agent_name]
-            phase_name = agent.phase.value
-            if phase_name not in plan_data["phases"]:
-                plan_data["phases"][phase_name] = []
-            plan_data["phases"][phase_name].append({
+            phases[agent.phase.value].append({
                 "name": agent_name,
                 "description": agent.description,
                 "outputs": agent.outputs
             })
         
-        plan_file.write_text(json.dumps(plan_data, indent=2))
+        plan_data = {
+            "generated": datetime.now().isoformat(),
+            "agents": plan,
+            "phases": dict(phases)
+        }
+        
+        # Write a temp file and swap it in, so an interrupted save never leaves a torn plan
+        tmp_file = plan_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(json.dumps(plan_data, indent=2).encode('utf-8'))
+        os.replace(tmp_file, plan_file)
         print(f"\n{Colors.GREEN}✅ Plan saved to: output/analysis_plan.json{Colors.RESET}")
     
     def run(self, mode: str = "full"):
@@ -546,22 +616,26 @@ class AgentOrchestrator:
                 print(f"  • {issue}")
             return 1
         
-        if mode == "workflow":
-            self.show_workflow()
-        elif mode == "interactive":
-            self.interactive_mode()
-        else:  # full mode
-            # Generate complete analysis plan
-            plan = self.generate_execution_plan()
-            self.show_execution_plan(plan)
-            
-            # Generate commands
-            commands = self.generate_commands(plan)
-            for cmd in commands:
-                print(cmd)
-            
-            # Save plan
-            self.save_plan(plan)
+        try:
+            if mode == "workflow":
+                self.show_workflow()
+            elif mode == "interactive":
+                self.interactive_mode()
+            else:  # full mode
+                # Generate complete analysis plan
+                plan = self.generate_execution_plan()
+                self.show_execution_plan(plan)
+                
+                # Generate commands
+                commands = self.generate_commands(plan)
+                for cmd in commands:
+                    print(cmd)
+                
+                # Save plan
+                self.save_plan(plan)
+        except ValueError as e:
+            print(f"\n{Colors.RED}Cannot plan execution: {e}{Colors.RESET}")
+            return 1
         
         return 0
 
@@ -588,7 +662,8 @@ def main():
     
     args = parser.parse_args()
     
-    if args.no_color:
+    # Escape codes only make sense on a terminal, not when output is piped or redirected
+    if args.no_color or not sys.stdout.isatty():
         Colors.disable()
     
     orchestrator = AgentOrchestrator()
@@ -6,12 +6,85 @@ Configures and validates MCP integrations for codebase analysis
 
 import os
 import sys
+import copy
 import json
 import subprocess
 import shutil
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+# Built-in configurations used when the framework templates are missing;
+# the project paths in them are placeholders that setup rewrites
+DEFAULT_MCP_CONFIG = {
+    "mcpServers": {
+        "serena": {
+            "command": "uvx",
+            "args": [
+                "--from",
+                "git+https://github.com/oraios/serena",
+                "serena",
+                "start-mcp-server",
+                "--context",
+                "ide-assistant",
+                "--project",
+                "${PWD}/codebase"
+            ],
+            "env": {},
+            "disabled": True,
+            "_comment": "OPTIONAL: Enable for semantic code analysis (60% token reduction)"
+        },
+        "filesystem": {
+            "command": "npx",
+            "args": [
+                "-y",
+                "@modelcontextprotocol/server-filesystem",
+                "${PWD}"
+            ],
+            "env": {}
+        },
+        "memory": {
+            "command": "npx",
+            "args": [
+                "-y",
+                "@modelcontextprotocol/server-memory"
+            ],
+            "env": {}
+        }
+    }
+}
+
+DEFAULT_REPOMIX_CONFIG = {
+    "output": {
+        "filePath": "output/reports/codebase-repomix.md",
+        "style": "markdown",
+        "removeComments": False,
+        "showLineNumbers": True
+    },
+    "include": [
+        "codebase/**/*"
+    ],
+    "ignore": {
+        "useGitignore": True,
+        "patterns": [
+            "**/node_modules/**",
+            "**/.git/**",
+            "**/dist/**",
+            "**/build/**",
+            "**/target/**",
+            "**/.idea/**",
+            "**/.vscode/**",
+            "**/*.log",
+            "**/*.tmp",
+            "**/coverage/**",
+            "**/.env*"
+        ]
+    },
+    "security": {
+        "enableSecurityCheck": True
+    }
+}
+
+
 class Colors:
     """Terminal colors (cross-platform)"""
     RED = '\033[91m'
@@ -23,9 +96,15 @@ class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
     
+    # Set once the Windows console mode has been configured
+    _windows_enabled = False
+    
     @staticmethod
     def enable_windows():
         """Enable ANSI colors on Windows 10+"""
+        if Colors._windows_enabled:
+            return
+        Colors._windows_enabled = True
         if sys.platform == 'win32':
             try:
                 import ctypes
@@ -37,9 +116,14 @@ class Colors:
     @staticmethod
     def disable():
         """Disable colors"""
-        for attr in dir(Colors):
-            if not attr.startswith('_') and attr.isupper():
-                setattr(Colors, attr, '')
+        Colors.RED = ''
+        Colors.GREEN = ''
+        Colors.YELLOW = ''
+        Colors.BLUE = ''
+        Colors.MAGENTA = ''
+        Colors.CYAN = ''
+        Colors.RESET = ''
+        Colors.BOLD = ''
 
 
 class MCPSetup:
@@ -66,6 +150,9 @@ class MCPSetup:
             "node": False
         }
         
+        # Parsed config templates, keyed by path
+        self._templates: Dict[Path, Dict] = {}
+        
         # Enable colors
         Colors.enable_windows()
     
@@ -76,18 +163,20 @@ class MCPSetup:
         print(f"{Colors.BLUE}╚════════════════════════════════════════════════════════════╝{Colors.RESET}")
         print()
     
+    def load_config_template(self, template_path: Path, default: Dict) -> Dict:
+        """Load a JSON config template once, falling back to the built-in default"""
+        if template_path not in self._templates:
+            if template_path.exists():
+                with open(template_path) as f:
+                    self._templates[template_path] = json.load(f)
+            else:
+                self._templates[template_path] = default
+        # Callers patch the config in place, so hand out a copy
+        return copy.deepcopy(self._templates[template_path])
+    
     def check_command(self, command: str) -> bool:
-        """Check if a command is available"""
-        try:
-            result = subprocess.run(
-                command.split() + ["--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        """Check if a command is available on PATH"""
+        return shutil.which(command.split()[0]) is not None
     
     def check_prerequisites(self):
         """Check for required tools"""
@@ -163,7 +252,9 @@ class MCPSetup:
         codebase_dir = self.project_root / "codebase"
         projects = []
         if codebase_dir.exists():
-            projects = [d.name for d in codebase_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
+            # scandir entries answer is_dir() from the directory listing, without a stat per entry
+            with os.scandir(codebase_dir) as entries:
+                projects = [e.name for e in entries if e.is_dir() and not e.name.startswith('.')]
         
         # Determine analysis scope
         print(f"\n{Colors.CYAN}MCP Configuration Options:{Colors.RESET}")
@@ -194,48 +285,7 @@ class MCPSetup:
             print(f"{Colors.GREEN}✅ Will analyze all repositories in codebase/{Colors.RESET}")
         
         # Load template
-        if self.mcp_template_path.exists():
-            with open(self.mcp_template_path) as f:
-                mcp_config = json.load(f)
-        else:
-            # Default configuration
-            mcp_config = {
-                "mcpServers": {
-                    "serena": {
-                        "command": "uvx",
-                        "args": [
-                            "--from",
-                            "git+https://github.com/oraios/serena",
-                            "serena",
-                            "start-mcp-server",
-                            "--context",
-                            "ide-assistant",
-                            "--project",
-                            f"${{PWD}}/codebase/{project_name}"
-                        ],
-                        "env": {},
-                        "disabled": True,
-                        "_comment": "OPTIONAL: Enable for semantic code analysis (60% token reduction)"
-                    },
-                    "filesystem": {
-                        "command": "npx",
-                        "args": [
-                            "-y",
-                            "@modelcontextprotocol/server-filesystem",
-                            "${PWD}"
-                        ],
-                        "env": {}
-                    },
-                    "memory": {
-                        "command": "npx",
-                        "args": [
-                            "-y",
-                            "@modelcontextprotocol/server-memory"
-                        ],
-                        "env": {}
-                    }
-                }
-            }
+        mcp_config = self.load_config_template(self.mcp_template_path, DEFAULT_MCP_CONFIG)
         
         # Update project path in config
         if "serena" in mcp_config["mcpServers"]:
@@ -288,40 +338,7 @@ class MCPSetup:
                         project_name = Path(project_path).name
         
         # Load template or use default
-        if self.repomix_template_path.exists():
-            with open(self.repomix_template_path) as f:
-                repomix_config = json.load(f)
-        else:
-            repomix_config = {
-                "output": {
-                    "filePath": f"output/reports/{project_name}-repomix.md",
-                    "style": "markdown",
-                    "removeComments": False,
-                    "showLineNumbers": True
-                },
-                "include": [
-                    f"codebase/{project_name}/**/*"
-                ],
-                "ignore": {
-                    "useGitignore": True,
-                    "patterns": [
-                        "**/node_modules/**",
-                        "**/.git/**",
-                        "**/dist/**",
-                        "**/build/**",
-                        "**/target/**",
-                        "**/.idea/**",
-                        "**/.vscode/**",
-                        "**/*.log",
-                        "**/*.tmp",
-                        "**/coverage/**",
-                        "**/.env*"
-                    ]
-                },
-                "security": {
-                    "enableSecurityCheck": True
-                }
-            }
+        repomix_config = self.load_config_template(self.repomix_template_path, DEFAULT_REPOMIX_CONFIG)
         
         # Update paths based on scope
         repomix_config["output"]["filePath"] = f"output/reports/{project_name}-repomix.md"
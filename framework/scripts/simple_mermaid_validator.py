@@ -7,31 +7,65 @@ Uses Mermaid CLI to validate syntax just like the browser does
 import os
 import re
 import json
+import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-def extract_mermaid_diagrams(content: str, file_path: str) -> List[Dict]:
-    """Extract all Mermaid diagrams from markdown or .mmd files"""
+# ```mermaid or ```mmd code blocks in raw markdown bytes
+MERMAID_BLOCK_PATTERN = re.compile(rb'```(?:mermaid|mmd)\s*\n(.*?)\n```', re.DOTALL)
+
+# Whitespace at the end of each line; [^\S\n] is the set str.rstrip() strips, minus the line break
+TRAILING_WHITESPACE_PATTERN = re.compile(r'[^\S\n]+$', re.MULTILINE)
+
+# Basic fixes that document-viewer.html handles, as (literal every match contains,
+# compiled pattern, replacement); the literal lets clean content skip the regex
+BASIC_FIXES = [
+    # 1. Fix indentation for comments (they should start at column 1)
+    ('%%', re.compile(r'^[ \t]+(%%.*)$', re.MULTILINE), r'\1'),
+    # 2. Fix multiple spaces after colons in Notes
+    ('Note', re.compile(r'(Note\s+(?:over|right of|left of)\s+[^:]+:)\s{2,}'), r'\1 '),
+    # 3. Remove @ symbols from stereotypes (class diagrams)
+    ('<<@', re.compile(r'<<@(\w+)>>'), r'<<\1>>'),
+    # 4. Fix excessive blank lines (max 2)
+    ('\n\n\n', re.compile(r'\n{3,}'), '\n\n'),
+]
+
+def decode_diagram(raw: bytes) -> str:
+    """Decode diagram bytes with the newline translation text-mode reads apply"""
+    text = raw.decode('utf-8')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def extract_mermaid_diagrams(content: bytes, file_path: str) -> List[Dict]:
+    """
+    Extract all Mermaid diagrams from raw markdown or .mmd file contents
+    Only the diagram text is decoded; the rest of a markdown file stays bytes
+    """
     diagrams = []
     
     # For .mmd files, the entire content is a diagram
     if file_path.endswith('.mmd'):
         diagrams.append({
-            'content': content,
+            'content': decode_diagram(content),
             'line_start': 1,
             'type': 'standalone'
         })
         return diagrams
     
-    # For .md files, extract from code blocks
-    # Pattern for ```mermaid or ```mmd blocks
-    pattern = r'```(?:mermaid|mmd)\s*\n(.*?)\n```'
-    
-    for match in re.finditer(pattern, content, re.DOTALL):
-        diagram_content = match.group(1)
-        line_start = content[:match.start()].count('\n') + 1
+    # For .md files, extract from ```mermaid or ```mmd code blocks,
+    # counting newlines only since the previous block to find the line number
+    line_start = 1
+    position = 0
+    for match in MERMAID_BLOCK_PATTERN.finditer(content):
+        diagram_bytes = match.group(1)
+        # In a CRLF file the block ends with the '\r' of the closing fence's line break
+        if diagram_bytes.endswith(b'\r'):
+            diagram_bytes = diagram_bytes[:-1]
+        diagram_content = decode_diagram(diagram_bytes)
+        line_start += content.count(b'\n', position, match.start())
+        position = match.start()
         diagrams.append({
             'content': diagram_content,
             'line_start': line_start,
@@ -40,19 +74,65 @@ def extract_mermaid_diagrams(content: str, file_path: str) -> List[Dict]:
     
     return diagrams
 
+def find_diagram_files(root: Path) -> List[Path]:
+    """
+    Find all .md files, then all .mmd files, under root in one os.scandir walk
+    Directories are visited depth-first in listing order, like Path.glob('**/...')
+    """
+    markdown_files = []
+    mermaid_files = []
+    pending = [root]
+    
+    while pending:
+        directory = pending.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Like glob, don't descend into symlinked directories
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.md'):
+                        markdown_files.append(Path(entry.path))
+                    elif entry.name.endswith('.mmd'):
+                        mermaid_files.append(Path(entry.path))
+        except OSError:
+            continue
+        # Reverse so the first subdirectory listed is walked next
+        pending.extend(reversed(subdirs))
+    
+    return markdown_files + mermaid_files
+
+# Mermaid CLI verdicts keyed by diagram text, so repeated diagrams render once
+_CLI_RESULTS: Dict[str, Tuple[bool, str]] = {}
+
+# Each Mermaid CLI run starts a headless browser, so only a few run at once
+MAX_CLI_WORKERS = 4
+
+# Command that runs the Mermaid CLI, chosen once by mermaid_cli_command()
+_MMDC_CMD: List[str] = []
+
+def mermaid_cli_command() -> List[str]:
+    """Use mmdc when it is on PATH, otherwise run the Mermaid CLI through npx"""
+    if not _MMDC_CMD:
+        if shutil.which('mmdc'):
+            _MMDC_CMD.append('mmdc')
+        else:
+            _MMDC_CMD.extend(['npx', '@mermaid-js/mermaid-cli'])
+    return _MMDC_CMD
+
 def validate_with_mermaid_cli(diagram_content: str) -> Tuple[bool, str]:
     """
     Validate diagram using Mermaid CLI (mmdc)
     This mimics what document-viewer.html does with mermaid.render()
     """
+    cached = _CLI_RESULTS.get(diagram_content)
+    if cached is not None:
+        return cached
+    
     try:
-        # Check if mmdc is installed
-        result = subprocess.run(['which', 'mmdc'], capture_output=True, text=True)
-        if result.returncode != 0:
-            # Try to use npx if mmdc not globally installed
-            mmdc_cmd = ['npx', '@mermaid-js/mermaid-cli']
-        else:
-            mmdc_cmd = ['mmdc']
+        mmdc_cmd = mermaid_cli_command()
         
         # Create temporary files
         with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False) as tmp_input:
@@ -72,10 +152,14 @@ def validate_with_mermaid_cli(diagram_content: str) -> Tuple[bool, str]:
                 os.unlink(tmp_output_path)
             
             if result.returncode == 0:
-                return True, "Valid"
+                verdict = (True, "Valid")
             else:
                 error_msg = result.stderr or result.stdout or "Unknown error"
-                return False, error_msg
+                verdict = (False, error_msg)
+            
+            # Only completed renders are cached; timeouts and launch errors may be transient
+            _CLI_RESULTS[diagram_content] = verdict
+            return verdict
                 
         except subprocess.TimeoutExpired:
             os.unlink(tmp_input_path)
@@ -91,27 +175,17 @@ def apply_basic_fixes(content: str) -> str:
     Apply the same basic fixes that work in document-viewer.html
     These are minimal, safe transformations that don't change semantics
     """
-    # Remove trailing whitespace
-    lines = content.split('\n')
-    lines = [line.rstrip() for line in lines]
-    content = '\n'.join(lines)
+    # Remove trailing whitespace in one pass instead of splitting into lines
+    content = TRAILING_WHITESPACE_PATTERN.sub('', content)
     
     # Ensure file ends with newline
     if not content.endswith('\n'):
         content += '\n'
     
     # Fix common issues that document-viewer.html handles
-    # 1. Fix indentation for comments (they should start at column 1)
-    content = re.sub(r'^[ \t]+(%%.*)$', r'\1', content, flags=re.MULTILINE)
-    
-    # 2. Fix multiple spaces after colons in Notes
-    content = re.sub(r'(Note\s+(?:over|right of|left of)\s+[^:]+:)\s{2,}', r'\1 ', content)
-    
-    # 3. Remove @ symbols from stereotypes (class diagrams)
-    content = re.sub(r'<<@(\w+)>>', r'<<\1>>', content)
-    
-    # 4. Fix excessive blank lines (max 2)
-    content = re.sub(r'\n{3,}', '\n\n', content)
+    for literal, pattern, replacement in BASIC_FIXES:
+        if literal in content:
+            content = pattern.sub(replacement, content)
     
     return content
 
@@ -125,8 +199,11 @@ def validate_file(file_path: str) -> Dict:
     }
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             content = f.read()
+        # Reject invalid UTF-8 as a text-mode read would; pure ASCII needs no decode
+        if not content.isascii():
+            content.decode('utf-8')
     except Exception as e:
         results['valid'] = False
         results['errors'].append(f"Could not read file: {str(e)}")
@@ -201,8 +278,7 @@ def main():
             files_to_validate.append(path)
     elif path.is_dir():
         # Find all .md and .mmd files
-        files_to_validate.extend(path.glob('**/*.md'))
-        files_to_validate.extend(path.glob('**/*.mmd'))
+        files_to_validate.extend(find_diagram_files(path))
     else:
         print(f"Error: {path} is not a valid file or directory")
         return 1
@@ -220,25 +296,31 @@ def main():
                 print(f"Fixed: {file_path}")
         print(f"\nFixed {fixed_count} files")
     
-    # Validate all files
+    # Validate all files, writing each file's report as its result arrives
     all_results = []
     total_valid = 0
     total_invalid = 0
     
-    for file_path in files_to_validate:
-        result = validate_file(str(file_path))
-        all_results.append(result)
+    # Files are independent and mostly wait on Mermaid CLI subprocesses, so
+    # validate a few at a time; map() still yields results in file order.
+    # The CLI command is picked before the workers start
+    mermaid_cli_command()
+    with ThreadPoolExecutor(max_workers=min(MAX_CLI_WORKERS, len(files_to_validate))) as executor:
+        results = executor.map(validate_file, [str(file_path) for file_path in files_to_validate])
         
-        if result['valid']:
-            total_valid += 1
-            if not args.json:
-                print(f"✅ {file_path}: Valid")
-        else:
-            total_invalid += 1
-            if not args.json:
-                print(f"❌ {file_path}: Invalid")
-                for error in result['errors']:
-                    print(f"   - {error}")
+        for file_path, result in zip(files_to_validate, results):
+            all_results.append(result)
+            
+            if result['valid']:
+                total_valid += 1
+                if not args.json:
+                    print(f"✅ {file_path}: Valid")
+            else:
+                total_invalid += 1
+                if not args.json:
+                    lines = [f"❌ {file_path}: Invalid"]
+                    lines.extend(f"   - {error}" for error in result['errors'])
+                    print('\n'.join(lines))
     
     # Output results
     if args.json: